@@ -7,6 +7,7 @@ import subprocess
 import json
 import concurrent.futures
 import ipaddress
+import importlib.util
 import sys
 import os
 
@@ -15,8 +16,15 @@ try:
     from dotenv import load_dotenv
     load_dotenv()  # Will search for .env in current and parent directories
 except ImportError:
-    print("Error loading .env file. No .env file found.")
-    pass
+    if __name__ == '__main__':
+        print("Error loading .env file. No .env file found.")
+
+# orjson parses the Thanos payloads several times faster; the stdlib parser is the fallback
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 
 def run_script_and_get_result(script_path, arguments=[]):
@@ -28,18 +36,19 @@ def run_script_and_get_result(script_path, arguments=[]):
     arguments: A list of arguments to pass to the script.
 
   Returns:
-    A string containing the output of the script, or None if an error occurred.
+    The raw (undecoded) bytes output of the script, or None if an error occurred.
+    The JSON parsers accept bytes directly, so no text decoding pass is needed.
   """
   try:
     # Construct the command to execute
     command = ["python", script_path] + arguments 
     # Run the script using subprocess
-    process = subprocess.run(command, capture_output=True, text=True)
+    process = subprocess.run(command, capture_output=True)
     # Check for errors
     if process.returncode == 0:
       return process.stdout.strip()  # Return the output
     else:
-      print(f"Error running script: {process.stderr}")
+      print(f"Error running script: {process.stderr.decode(errors='replace')}")
       return None
 
   except FileNotFoundError:
@@ -73,52 +82,45 @@ def is_ipv6(address):
   Returns:
     True if the address is a valid IPv6 address, False otherwise.
   """
+  # cheap pre-check so obvious misses (None, IPv4, empty) skip the exception path
+  if not isinstance(address, str) or ':' not in address:
+    return False
   try:
     ipaddress.IPv6Address(address)
     return True
   except ipaddress.AddressValueError:
     return False
 
-def find_IpAddr(json_string, search):
+def find_IpAddr(payload, search):
     """
-    Finds and extracts all 'cpeIpv6Addr' values from a JSON string.
+    Finds and extracts the first 'search' value from a Thanos query result.
 
     Args:
-      json_string: The JSON string to search.
+      payload: The decoded query result (dict) or its raw JSON (str or bytes).
+      search: The metric label to extract, e.g. 'cpeIpv6Addr'.
 
     Returns:
-      A list of 'cpeIpv6Addr' values found in the JSON string.
+      The label value, or None if it cannot be found.
     """
+    if payload is None:
+        return
     try:
-        data = json.loads(json_string)
-        match = "" 
+        # the in-process client already returns a dict, only subprocess output needs decoding
+        data = json_loads(payload) if isinstance(payload, (str, bytes)) else payload
 
+        # return the first result that actually carries the label, not just the first result
         for result_item in data['data']['result']:
-            match = result_item['metric'][search]
-            return match
+            match = result_item.get('metric', {}).get(search)
+            if match:
+                return match
 
-    except json.JSONDecodeError:
+    except json.JSONDecodeError:  # orjson.JSONDecodeError is a subclass
         print("Invalid JSON string.")
         return
     except KeyError:
         #print(f"Can't find {search}")
         return
 
-def is_ipv6(address):
-  """
-  Checks if a string is a valid IPv6 address.
-
-  Args:
-    address: The string to check.
-
-  Returns:
-    True if the address is a valid IPv6 address, False otherwise.
-  """
-  try:
-    ipaddress.IPv6Address(address)
-    return True
-  except ipaddress.AddressValueError:
-    return False
     
 def is_ipv4(address):
   """
@@ -130,85 +132,234 @@ def is_ipv4(address):
   Returns:
     True if the address is a valid IPv4 address, False otherwise.
   """
+  # cheap pre-check so obvious misses (None, IPv6, empty) skip the exception path
+  if not isinstance(address, str) or address.count('.') != 3:
+    return False
   try:
     ipaddress.IPv4Address(address)
     return True
   except ipaddress.AddressValueError:
     return False
-path = "./toybox-main"
+# toybox-main next to this script, so the lookup works from any working directory and when imported by the GUI
+path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "toybox-main")
 # path = "C:/Users/mmorri890/Documents/AmpPython/James EC_FDX_AMP Python Scripts/toybox-main"
 #path = "C:/Users/mmorri890/Documents/AmpPython/James EC_FDX_AMP Python Scripts/CM & RPD Data Collector (v2.1.3 and v2.2.3w)"
-if len(sys.argv)== 4:  # Check if exactly 3 arguments are provided
-    Short_output = True
-    # Assign arguments to variables
-    arg1 = sys.argv[1]   # 'PROD or 'DEV', CM in Prod or Dev (preprod) environment
-    arg2 = sys.argv[2]  # 'CM' or 'CPE', need CM IP or CPE IP
-    arg3 = sys.argv[3]  # list of CM MAC addresses
-else:
-    Short_output = False
-    # for manual and multiple mac vs ip lookup
-    print("Please provide 3 arguments: PROD or DEV, CM or CPE, MACs")
-    arg1 = 'PROD'   # 'PROD or 'DEV', CM in Prod or Dev (preprod) environment
-    arg2 = 'CPE'  # 'CM' or 'CPE', need CM IP or CPE IP
-    #arg3 = ["24:a1:86:00:45:60","24:a1:86:00:c5:8c","24:a1:86:00:c5:98","24:a1:86:00:40:e4","24:a1:86:00:c1:40","24:a1:86:00:45:8c","24:a1:86:00:c5:84","24:a1:86:00:41:30","24:a1:86:00:c5:7c","24:a1:86:00:45:64","24:a1:86:00:41:34","24:a1:86:00:41:44","24:a1:86:00:45:68"]  # list of CM MAC addresses
-    arg3 = ['8c:76:3f:f0:78:b0','8c:76:3f:f0:78:c4','10:e1:77:58:d1:78','ac:db:48:bb:d0:c0','ac:db:48:bb:cf:c8','ac:db:48:bb:cf:ec','10:e1:77:58:d1:ac','ac:db:48:bb:cf:e8','8c:76:3f:f0:79:b0','ac:db:48:bb:cf:14','ac:db:48:bb:cf:10','10:e1:77:58:d1:88','ac:db:48:bb:cf:e0','ac:db:48:bb:cf:0c']  # list of CM MAC addresses
-    arg3 = ['aa:76:3f:f0:78:b0','8c:76:3f:f0:78:c4','10:e1:77:58:d1:78','ac:db:48:bb:d0:c0','ac:db:48:bb:cf:c8','ac:db:48:bb:cf:ec','10:e1:77:58:d1:ac','ac:db:48:bb:cf:e8','8c:76:3f:f0:79:b0','ac:db:48:bb:cf:14','ac:db:48:bb:cf:10','10:e1:77:58:d1:88','ac:db:48:bb:cf:e0','ac:db:48:bb:cf:0c']  # list of CM MAC addresses
-
-
-if arg1 == "PROD":
-    url = "https://sat-prod.codebig2.net/v2/ws/token.oauth2"
-    PROD_secret = os.environ.get("PROD_API_KEY")
-    if PROD_secret is None:
-        print("PROD_API_KEY environment variable not set.")
-        sys.exit(1)
-    secret = PROD_secret
-    tag = 'prod'
-elif arg1 == "DEV":
-    url = "https://sat-stg.codebig2.net/v2/ws/token.oauth2"
-    DEV_secret = os.environ.get("DEV_API_KEY")
-    if DEV_secret is None:
-        print("DEV_API_KEY environment variable not set.")
+
+
+def import_toybox_module(name):
+    """
+    Imports a toybox client from its file in path, without putting path on sys.path.
+
+    Args:
+      name: The module name, e.g. 'websec'.
+
+    Returns:
+      The module, or None if it cannot be imported (e.g. missing requests).
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    try:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(path, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        # registered first so thanos2's 'from websec import ...' resolves to this copy
+        sys.modules[name] = module
+        spec.loader.exec_module(module)
+        return module
+    except (ImportError, OSError):
+        sys.modules.pop(name, None)
+        return None
+
+
+# Import the toybox clients in-process to avoid one interpreter start per lookup;
+# fall back to running them as scripts if they cannot be imported
+websec = import_toybox_module("websec")
+thanos2 = import_toybox_module("thanos2") if websec is not None else None
+
+THANOS_CLIENT_ID = "ngan-hs"
+THANOS_SCOPE = "ngan:telemetry:thanosapi"
+
+
+def get_token(tag, url, secret):
+    """
+    Returns a Thanos bearer token, reusing websec's cached token while it is still valid.
+
+    Args:
+      tag: 'prod' or 'dev'.
+      url: The websec token server URL.
+      secret: The client secret for the environment.
+
+    Returns:
+      The token, or None if it could not be fetched in-process.
+    """
+    label = f"thanos-{tag}"
+    if websec is None:
+        # Register the account with websec.py; thanos2 fetches and caches the token itself on its first query
+        script = os.path.join(path, 'websec.py')
+        run_script(script, [label, "--url", url, "--id", THANOS_CLIENT_ID, "--secret", secret, "--scope", THANOS_SCOPE])
+        return None
+
+    ws = websec.WebsecTokenService()
+    # set_info() clears the cached token, so only re-register when the account details changed
+    info = ws.get_info(label)
+    if not info or tuple(info[:4]) != (url, THANOS_CLIENT_ID, secret, THANOS_SCOPE):
+        ws.set_info(label, url, THANOS_CLIENT_ID, secret, THANOS_SCOPE)
+    return ws.get_token(label, expiry_slack=30)
+
+
+# MACs per Thanos query; keeps the cmMacAddr=~"a|b|..." regex and request URL reasonably short
+MAC_BATCH_SIZE = 50
+
+
+def query_thanos(tag, k_matrix, macs, token=None):
+    """
+    Queries Thanos for a batch of CM MAC addresses with a single request.
+
+    Args:
+      tag: 'prod' or 'dev'.
+      k_matrix: The metric to query, e.g. 'K_CmCpeList'.
+      macs: The CM MAC addresses to filter on.
+      token: Bearer token fetched once by the caller, shared by all in-process queries.
+
+    Returns:
+      The decoded result (in-process) or raw JSON bytes (subprocess), or None on error.
+    """
+    mac_filter = f"cmMacAddr={macs[0]}" if len(macs) == 1 else f"cmMacAddr=~{'|'.join(macs)}"
+    if thanos2 is None:
+        return run_script_and_get_result(os.path.join(path, "thanos2.py"), [f"--{tag}", k_matrix, mac_filter])
+    try:
+        return thanos2.thanos_query(k_matrix, [mac_filter], prod_dev=tag, token=token)
+    except Exception as e:
+        print(f"Error querying Thanos for {', '.join(macs)}: {e}")
+        return None
+
+def split_results_by_mac(payload):
+    """
+    Splits a batched Thanos query result into one result per CM MAC address.
+
+    Args:
+      payload: The decoded query result (dict) or its raw JSON (str or bytes).
+
+    Returns:
+      A dict of lower-case MAC -> result in the query response shape, so find_IpAddr applies unchanged.
+    """
+    if payload is None:
+        return {}
+    try:
+        data = json_loads(payload) if isinstance(payload, (str, bytes)) else payload
+        result_items = data['data']['result']
+    except json.JSONDecodeError:
+        print("Invalid JSON string.")
+        return {}
+    except (KeyError, TypeError):
+        return {}
+
+    items_by_mac = {}
+    for result_item in result_items:
+        mac = result_item.get('metric', {}).get('cmMacAddr')
+        if mac:
+            items_by_mac.setdefault(mac.lower(), []).append(result_item)
+    return {mac: {'data': {'result': items}} for mac, items in items_by_mac.items()}
+
+# Token server per environment; the client secret comes from <ENV>_API_KEY
+TOKEN_URLS = {
+    "PROD": "https://sat-prod.codebig2.net/v2/ws/token.oauth2",
+    "DEV": "https://sat-stg.codebig2.net/v2/ws/token.oauth2",
+}
+# Thanos metric and IPv4/IPv6 labels per address type
+IP_LABELS = {
+    "CM": ('K_CmRegStatus_Config', 'ipV4Addr', 'ipv6Addr'),
+    "CPE": ('K_CmCpeList', 'cpeIpv4Addr', 'cpeIpv6Addr'),
+}
+
+
+def lookup(env, ip_type, macs):
+    """
+    Looks up the CM or CPE IP address of one or more CM MAC addresses.
+
+    Args:
+      env: 'PROD' or 'DEV', CM in Prod or Dev (preprod) environment.
+      ip_type: 'CM' or 'CPE', need CM IP or CPE IP.
+      macs: A CM MAC address or a list of them.
+
+    Returns:
+      A dict of MAC -> IPv4 address (if usable) or IPv6 address, in input order; None where nothing was found.
+
+    Raises:
+      ValueError: If env/ip_type is unknown or the API key for env is not set.
+    """
+    if env not in TOKEN_URLS:
+        raise ValueError(f"Unknown environment '{env}'. Use PROD or DEV.")
+    if ip_type not in IP_LABELS:
+        raise ValueError(f"Unknown IP type '{ip_type}'. Use CM or CPE.")
+    secret = os.environ.get(f"{env}_API_KEY")
+    if secret is None:
+        raise ValueError(f"{env}_API_KEY environment variable not set.")
+    tag = env.lower()
+    k_matrix, find_ipv4, find_ipv6 = IP_LABELS[ip_type]
+
+    token = get_token(tag, TOKEN_URLS[env], secret)
+    #print(f"Token updated: {token}")
+
+    mac_list = [macs] if isinstance(macs, str) else list(macs)
+    # query the macs in batches (concurrently when there are several), then report in input order
+    batches = [mac_list[i:i + MAC_BATCH_SIZE] for i in range(0, len(mac_list), MAC_BATCH_SIZE)]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, min(32, len(batches)))) as executor:
+        futures = [executor.submit(query_thanos, tag, k_matrix, batch, token) for batch in batches]
+
+    results_by_mac = {}
+    for future in futures:
+        results_by_mac.update(split_results_by_mac(future.result()))
+
+    ips = {}
+    for mac in mac_list:
+        result = results_by_mac.get(mac.lower())
+        # Get the IP address
+        ip = find_IpAddr(result, find_ipv4)   #ipV4Addr, ipv6Addr, cpeIpv6Addr
+        if not (is_ipv4(ip) and not ip == '0.0.0.0'):
+            ip = find_IpAddr(result, find_ipv6)
+            if not is_ipv6(ip):
+                ip = None
+        ips[mac] = ip
+    return ips
+
+
+if __name__ == '__main__':
+    if len(sys.argv) >= 4 and sys.argv[3] == '--batch':
+        # Batch mode: <PROD|DEV> <CM|CPE> --batch MAC [MAC ...] prints one JSON object of MAC -> IP (null if not found)
+        try:
+            print(json.dumps(lookup(sys.argv[1], sys.argv[2], sys.argv[4:])))
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
+    if len(sys.argv)== 4:  # Check if exactly 3 arguments are provided
+        Short_output = True
+        # Assign arguments to variables
+        arg1 = sys.argv[1]   # 'PROD or 'DEV', CM in Prod or Dev (preprod) environment
+        arg2 = sys.argv[2]  # 'CM' or 'CPE', need CM IP or CPE IP
+        arg3 = sys.argv[3]  # list of CM MAC addresses
+    else:
+        Short_output = False
+        # for manual and multiple mac vs ip lookup
+        print("Please provide 3 arguments: PROD or DEV, CM or CPE, MACs")
+        arg1 = 'PROD'   # 'PROD or 'DEV', CM in Prod or Dev (preprod) environment
+        arg2 = 'CPE'  # 'CM' or 'CPE', need CM IP or CPE IP
+        #arg3 = ["24:a1:86:00:45:60","24:a1:86:00:c5:8c","24:a1:86:00:c5:98","24:a1:86:00:40:e4","24:a1:86:00:c1:40","24:a1:86:00:45:8c","24:a1:86:00:c5:84","24:a1:86:00:41:30","24:a1:86:00:c5:7c","24:a1:86:00:45:64","24:a1:86:00:41:34","24:a1:86:00:41:44","24:a1:86:00:45:68"]  # list of CM MAC addresses
+        arg3 = ['8c:76:3f:f0:78:b0','8c:76:3f:f0:78:c4','10:e1:77:58:d1:78','ac:db:48:bb:d0:c0','ac:db:48:bb:cf:c8','ac:db:48:bb:cf:ec','10:e1:77:58:d1:ac','ac:db:48:bb:cf:e8','8c:76:3f:f0:79:b0','ac:db:48:bb:cf:14','ac:db:48:bb:cf:10','10:e1:77:58:d1:88','ac:db:48:bb:cf:e0','ac:db:48:bb:cf:0c']  # list of CM MAC addresses
+        arg3 = ['aa:76:3f:f0:78:b0','8c:76:3f:f0:78:c4','10:e1:77:58:d1:78','ac:db:48:bb:d0:c0','ac:db:48:bb:cf:c8','ac:db:48:bb:cf:ec','10:e1:77:58:d1:ac','ac:db:48:bb:cf:e8','8c:76:3f:f0:79:b0','ac:db:48:bb:cf:14','ac:db:48:bb:cf:10','10:e1:77:58:d1:88','ac:db:48:bb:cf:e0','ac:db:48:bb:cf:0c']  # list of CM MAC addresses
+
+    try:
+        ips = lookup(arg1, arg2, arg3)
+    except ValueError as e:
+        print(e)
         sys.exit(1)
-    secret = DEV_secret
-    tag = 'dev'
-if arg2 == "CM":
-    k_matrix = 'K_CmRegStatus_Config'
-    find_ipv4 = 'ipV4Addr'
-    find_ipv6 = 'ipv6Addr'
-elif arg2 == "CPE":
-    k_matrix = 'K_CmCpeList'
-    find_ipv4 = 'cpeIpv4Addr'
-    find_ipv6 = 'cpeIpv6Addr'
-        
-script = os.path.join(path, 'websec.py')
-arguments = ["thanos-prod", "--url", url, "--id", "ngan-hs", "--secret", secret, "--scope", "ngan:telemetry:thanosapi"]
-run_script(script, arguments)
-arguments = [f"thanos-{tag}", "--bearer"]
-token = run_script_and_get_result(script, arguments)
-#print(f"Token updated: {token}")
-
-# if arg3 is a string, convert it to a list
-if isinstance(arg3, str):
-    mac_list = [arg3]
-else:
-    mac_list = arg3
-# re-iterate the loop for multiple mac
-for mac in mac_list:
-    arguments = [f"--{tag}", k_matrix, f"cmMacAddr={mac}"]
-    script = os.path.join(path, "thanos2.py")
-    result = run_script_and_get_result(script, arguments)
-    #print(result)
-    # Get the IP address
-    ip = find_IpAddr(result, find_ipv4)   #ipV4Addr, ipv6Addr, cpeIpv6Addr
-    if is_ipv4(ip) and not ip == '0.0.0.0':
+
+    _, find_ipv4, find_ipv6 = IP_LABELS[arg2]
+    for mac, ip in ips.items():
+        if ip is None:
+            continue
         if Short_output:
             print(ip)
         else:
-            print(f"CM MAC = {mac}, {find_ipv4} = {ip}")
-    else:
-        ip = find_IpAddr(result, find_ipv6)
-        if is_ipv6(ip):
-            if Short_output:
-                print(ip)
-            else:
-                print(f"CM MAC = {mac}, {find_ipv6} = {ip}")
\ No newline at end of file
+            print(f"CM MAC = {mac}, {find_ipv4 if is_ipv4(ip) else find_ipv6} = {ip}")
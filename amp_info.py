@@ -27,7 +27,12 @@ import os
 import logging
 import macaddress
 
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+# orjson parses the Thanos payloads several times faster; the stdlib parser is the fallback
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
 
 # --- Load environment variables from .env file ---
 try:
@@ -36,6 +41,9 @@ try:
 except ImportError:
     print("python-dotenv is not installed. Install with: pip install python-dotenv")
 
+# Per-script timeout for the websec/thanos2 helpers (seconds)
+SCRIPT_TIMEOUT = 60
+
 
 def run_script_and_get_result(script_path, arguments=[]):
     logging.debug(f"Running script for result: {script_path} with arguments: {arguments}")
@@ -51,7 +59,7 @@ def run_script_and_get_result(script_path, arguments=[]):
     """
     try:
         command = [sys.executable, script_path] + arguments
-        process = subprocess.run(command, capture_output=True, text=True)
+        process = subprocess.run(command, capture_output=True, text=True, timeout=SCRIPT_TIMEOUT)
         if process.returncode == 0:
             return process.stdout.strip()
         else:
@@ -64,6 +72,9 @@ def run_script_and_get_result(script_path, arguments=[]):
     except FileNotFoundError:
         logging.warning(f"Script not found: {script_path}")
         return None
+    except subprocess.TimeoutExpired:
+        logging.warning(f"Script timed out after {SCRIPT_TIMEOUT}s: {script_path}")
+        return None
 
 
 def run_script(script_path, arguments=[]):
@@ -71,7 +82,7 @@ def run_script(script_path, arguments=[]):
     """Runs a Python script in a subprocess and logs errors if any."""
     try:
         command = [sys.executable, script_path] + arguments
-        process = subprocess.run(command, capture_output=True, text=True)
+        process = subprocess.run(command, capture_output=True, text=True, timeout=SCRIPT_TIMEOUT)
         if process.returncode != 0:
             logging.warning(f"Error running script {script_path} (rc={process.returncode})")
             if process.stderr:
@@ -80,6 +91,8 @@ def run_script(script_path, arguments=[]):
                 logging.debug(f"[stdout]: {process.stdout.strip()[:500]}")
     except FileNotFoundError:
         logging.warning(f"Script not found: {script_path}")
+    except subprocess.TimeoutExpired:
+        logging.warning(f"Script timed out after {SCRIPT_TIMEOUT}s: {script_path}")
 
 
 def is_ipv6(address):
@@ -122,8 +135,8 @@ def is_mac(mac):
 def safe_json_load(s):
     logging.debug("Parsing JSON response")
     try:
-        return json.loads(s)
-    except (json.JSONDecodeError, TypeError):
+        return json_loads(s)
+    except (json.JSONDecodeError, TypeError):  # orjson.JSONDecodeError is a subclass
         logging.debug("Failed to parse JSON. safe_json_load returning None.")
         return None
 
@@ -168,108 +181,109 @@ def find_IpAddr(json_string, search):
     return None
 
 
-# --- Begin main behavior ---
-if __name__ == '__main__':
-    path = "./toybox-main"
-    Short_output = len(sys.argv) == 4
-    if Short_output:
-        arg1 = 'PROD' #sys.argv[1]   # 'PROD' or 'DEV'
-        arg2 = 'CPE' #sys.argv[2]   # 'CM' or 'CPE'
-        arg3 = sys.argv[3]   # CM MAC or IP
-    else:
-        print("Please at least provide 3 arguments: <PROD or DEV>, <CM or CPE>, <MAC or IP>")
-        arg1 = 'PROD'
-        arg2 = 'CPE'
-        arg3 = ''
-    
-#2001:0558:40A0:0013:DD18:FF03:710D:6047    CM Do not use
-#2001:0558:6043:003F:2855:D2DC:2D77:FD23    CPE MACs for testing
-    if arg1 == "PROD":
+def get_amp_info(env, role, addr, path="./toybox-main"):
+    """
+    Looks up a CM/CPE in Thanos by MAC or IP address.
+
+    Args:
+      env: 'PROD' or 'DEV'.
+      role: 'CM' or 'CPE'.
+      addr: A CM MAC address (looks up the IPv6 address) or an IPv4/IPv6 address (looks up the CM MAC).
+      path: Directory containing websec.py and thanos2.py.
+
+    Returns:
+      A dict with the found key (e.g. 'cpeIpv6Addr' or 'cmMacAddr') and 'fnName', or None if nothing was found.
+
+    Raises:
+      ValueError: If env/role is unknown or the API key for env is not set.
+    """
+    if env == "PROD":
         url = "https://sat-prod.codebig2.net/v2/ws/token.oauth2"
-        PROD_secret = os.environ.get("PROD_API_KEY")
-        if PROD_secret is None:
-            print("PROD_API_KEY environment variable not set.")
-            sys.exit(1)
-        secret = PROD_secret
+        secret = os.environ.get("PROD_API_KEY")
         tag = 'prod'
-    elif arg1 == "DEV":
+    elif env == "DEV":
         url = "https://sat-stg.codebig2.net/v2/ws/token.oauth2"
-        DEV_secret = os.environ.get("DEV_API_KEY")
-        if DEV_secret is None:
-            print("DEV_API_KEY environment variable not set.")
-            sys.exit(1)
-        secret = DEV_secret
+        secret = os.environ.get("DEV_API_KEY")
         tag = 'dev'
     else:
-        print(f"Unknown environment '{arg1}'. Use PROD or DEV.")
-        sys.exit(1)
+        raise ValueError(f"Unknown environment '{env}'. Use PROD or DEV.")
+    if secret is None:
+        raise ValueError(f"{env}_API_KEY environment variable not set.")
 
     # Determine target type
-    if arg2 == "CM":
+    if role == "CM":
         k_matrix = 'K_CmRegStatus_Config'
         find_ipv4 = 'ipV4Addr'
         find_ipv6 = 'ipv6Addr'
         find_mac = 'cmMacAddr'
-    elif arg2 == "CPE":
-
+    elif role == "CPE":
         k_matrix = 'K_CmCpeList'
         find_ipv4 = 'cpeIpv4Addr'
         find_ipv6 = 'cpeIpv6Addr'
         find_mac = 'cmMacAddr'
-    
     else:
-        print(f"Unknown target '{arg2}'. Use CM or CPE.")
-        sys.exit(1)
+        raise ValueError(f"Unknown target '{role}'. Use CM or CPE.")
 
     websec = os.path.join(path, 'websec.py')
     thanos2 = os.path.join(path, 'thanos2.py')
 
-    # Acquire token via websec.py
-    logging.debug("Acquiring token via websec.py")
+    # Register the account via websec.py; thanos2.py fetches and caches the token itself
+    logging.debug("Registering Thanos account via websec.py")
     run_script(websec, ["thanos-prod", "--url", url, "--id", "ngan-hs", "--secret", secret, "--scope", "ngan:telemetry:thanosapi"])
-    token = run_script_and_get_result(websec, [f"thanos-{tag}", "--bearer"]) or ""
 
-
-    if (is_ipv4(arg3) or is_ipv6(arg3)):
-        logging.debug(f"Input argument is IP address: {arg3}. Need to find the MAC")
-        if is_ipv4(arg3):
-            logging.debug("Searching by IPv4 address")
-            arguments = [f"--{tag}", k_matrix, f"{find_ipv4}={arg3}"]
-        elif is_ipv6(arg3):
-            logging.debug("Searching by IPv6 address")
-            arguments = [f"--{tag}", k_matrix, f"{find_ipv6}={arg3}"]
-        else:
-            logging.error("Invalid IP address provided.")
-            sys.exit(1)
-    elif is_mac(arg3):
-        # mac = arg3
-        logging.debug(f"Input argument is MAC address: {arg3}")
-        arguments = [f"--{tag}", k_matrix, f"{find_mac}={arg3}"]
+    if is_ipv4(addr):
+        logging.debug(f"Input argument is IPv4 address: {addr}. Need to find the MAC")
+        arguments = [f"--{tag}", k_matrix, f"{find_ipv4}={addr}"]
+        search = find_mac
+    elif is_ipv6(addr):
+        logging.debug(f"Input argument is IPv6 address: {addr}. Need to find the MAC")
+        arguments = [f"--{tag}", k_matrix, f"{find_ipv6}={addr}"]
+        search = find_mac
+    elif is_mac(addr):
+        logging.debug(f"Input argument is MAC address: {addr}")
+        arguments = [f"--{tag}", k_matrix, f"{find_mac}={addr}"]
+        search = find_ipv6
+    else:
+        logging.warning(f"'{addr}' is not a valid MAC or IP address.")
+        return None
 
     logging.debug(f"------------ {arguments}  --------------------")
     result = run_script_and_get_result(thanos2, arguments)
-        
-    # If no result, try again passing bearer explicitly (if supported)
-    if (not result) and token:
-        logging.debug("No result from thanos2.py, retrying with --bearer token")
-        # arguments_bearer = [f"--{tag}", k_matrix, f"cmMacAddr={arg3}", "--bearer", token]
-        # result = run_script_and_get_result(thanos2, arguments_bearer)
-
     if not result:
-        print(f"CM MAC = {arg3}: no result from thanos2.py")
-        # continue
-
-    ## Process the reslt and pull the right key:value
-    if is_ipv4(arg3): #we're passing an ipv4 looking for mac
-        mac = find_IpAddr(result, find_mac)
-        #print(f"Functionality not yet implemented for IPv4 to MAC lookup.")
-        print(mac if Short_output else f"IPv4 = {arg3}, {find_mac} = {mac}")
-    elif is_ipv6(arg3):# passing ipv6 looking for mac
-        mac = find_IpAddr(result, find_mac)
-        print(mac if Short_output else f"IPv6 = {arg3}, {find_mac} = {mac}")
-    elif is_mac(arg3): # passing mac looking for ipv6
-        ip = find_IpAddr(result, find_ipv6)
-        print(ip if Short_output else f"IPv6 = {arg3}, {find_ipv6} = {ip}")
+        logging.warning(f"{addr}: no result from thanos2.py")
+        return None
+
+    ## Process the result and pull the right key:value
+    return find_IpAddr(result, search)
+
+
+# --- Begin main behavior ---
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+    Short_output = len(sys.argv) == 4
+    if Short_output:
+        arg1 = 'PROD' #sys.argv[1]   # 'PROD' or 'DEV'
+        arg2 = 'CPE' #sys.argv[2]   # 'CM' or 'CPE'
+        arg3 = sys.argv[3]   # CM MAC or IP
+    else:
+        print("Please at least provide 3 arguments: <PROD or DEV>, <CM or CPE>, <MAC or IP>")
+        arg1 = 'PROD'
+        arg2 = 'CPE'
+        arg3 = ''
+    
+#2001:0558:40A0:0013:DD18:FF03:710D:6047    CM Do not use
+#2001:0558:6043:003F:2855:D2DC:2D77:FD23    CPE MACs for testing
+    try:
+        info = get_amp_info(arg1, arg2, arg3)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    if is_ipv4(arg3):
+        print(json.dumps(info) if Short_output else f"IPv4 = {arg3}, cmMacAddr = {info}")
+    elif is_ipv6(arg3):
+        print(json.dumps(info) if Short_output else f"IPv6 = {arg3}, cmMacAddr = {info}")
+    elif is_mac(arg3):
+        print(json.dumps(info) if Short_output else f"MAC = {arg3}, IPv6 = {info}")
     else:
-        print(f"CM MAC = {arg3}: No valid {find_ipv4}/{find_ipv6} found.")
-        
\ No newline at end of file
+        print(f"{arg3}: No valid MAC or IP address given.")
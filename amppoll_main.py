@@ -1,42 +1,48 @@
 # amppoll_main.py - Main GUI for Amp Polling Tool
-from tkinter import *
-import tkinter as tk
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
+# tkinter/ttkbootstrap are imported inside main() so importing this module stays cheap (and works headless)
 
-def calculate(*args):
-    try:
-        value = float(feet.get())
-        meters.set(round(0.3048 * value, 4))
-    except ValueError:
-        pass
 
-root = Tk()
-root.title("AmpPoll - A lightweight utility to poll FDX amplifiers for key performance metrics")
+def main():
+    from tkinter import Tk, StringVar, N, W, E, S
+    import ttkbootstrap as ttk
 
-mainframe = ttk.Frame(root, padding=(3, 3, 12, 12))
-mainframe.grid(column=0, row=0, sticky=(N, W, E, S))
+    def calculate(*args):
+        try:
+            value = float(feet.get())
+            meters.set(round(0.3048 * value, 4))
+        except ValueError:
+            pass
 
-feet = StringVar()
-feet_entry = ttk.Entry(mainframe, width=7, textvariable=feet)
-feet_entry.grid(column=2, row=1, sticky=(W, E))
+    root = Tk()
+    root.title("AmpPoll - A lightweight utility to poll FDX amplifiers for key performance metrics")
 
-meters = StringVar()
-ttk.Label(mainframe, textvariable=meters).grid(column=2, row=2, sticky=(W, E))
+    mainframe = ttk.Frame(root, padding=(3, 3, 12, 12))
+    mainframe.grid(column=0, row=0, sticky=(N, W, E, S))
 
-ttk.Button(mainframe, text="Calculate", command=calculate).grid(column=3, row=3, sticky=W)
+    feet = StringVar()
+    feet_entry = ttk.Entry(mainframe, width=7, textvariable=feet)
+    feet_entry.grid(column=2, row=1, sticky=(W, E))
 
-ttk.Label(mainframe, text="feet").grid(column=3, row=1, sticky=W)
-ttk.Label(mainframe, text="is equivalent to").grid(column=1, row=2, sticky=E)
-ttk.Label(mainframe, text="meters").grid(column=3, row=2, sticky=W)
+    meters = StringVar()
+    ttk.Label(mainframe, textvariable=meters).grid(column=2, row=2, sticky=(W, E))
 
-root.columnconfigure(0, weight=1)
-root.rowconfigure(0, weight=1)
-mainframe.columnconfigure(2, weight=1)
-for child in mainframe.winfo_children(): 
-    child.grid_configure(padx=5, pady=5)
+    ttk.Button(mainframe, text="Calculate", command=calculate).grid(column=3, row=3, sticky=W)
 
-feet_entry.focus()
-root.bind("<Return>", calculate)
+    ttk.Label(mainframe, text="feet").grid(column=3, row=1, sticky=W)
+    ttk.Label(mainframe, text="is equivalent to").grid(column=1, row=2, sticky=E)
+    ttk.Label(mainframe, text="meters").grid(column=3, row=2, sticky=W)
 
-root.mainloop()
\ No newline at end of file
+    root.columnconfigure(0, weight=1)
+    root.rowconfigure(0, weight=1)
+    mainframe.columnconfigure(2, weight=1)
+    for child in mainframe.winfo_children(): 
+        child.grid_configure(padx=5, pady=5)
+
+    feet_entry.focus()
+    root.bind("<Return>", calculate)
+
+    root.mainloop()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,55 +1,40 @@
 import numpy as np
 import logging
-import pandas as pd
 import re
 import math
 import os
 import parsers
 import struct
+import functools
+
+# Channel definition formats, e.g. '99M-1215M(6M)' (range with step) and '1250M(10M)' (single)
+_RANGE_RE = re.compile(r"([\d\.]+[KMG]?)-([\d\.]+[KMG]?)\(([\d\.]+[KMG]?)\)")
+_SINGLE_RE = re.compile(r"([\d\.]+[KMG]?)\(([\d\.]+[KMG]?)\)")
 
 def complex_to_mag_db(real, imag):
     """Converts complex number components (real, imag) to magnitude in dB."""
     if not isinstance(real, list) or not isinstance(imag, list) or len(real) != len(imag):
         return []
-    magnitude = np.sqrt(np.array(real)**2 + np.array(imag)**2)
-    with np.errstate(divide='ignore'):
-        mag_db = 20 * np.log10(magnitude)
-    mag_db[np.isneginf(mag_db)] = -100
+    real_np = np.asarray(real, dtype=np.float64)
+    imag_np = np.asarray(imag, dtype=np.float64)
+    # 20*log10(|z|) == 10*log10(|z|^2); zero-magnitude taps keep the -100 dB floor.
+    power = real_np * real_np + imag_np * imag_np
+    nonzero = power > 0
+    mag_db = np.full_like(power, -100.0)
+    np.log10(power, out=mag_db, where=nonzero)
+    np.multiply(mag_db, 10.0, out=mag_db, where=nonzero)
     return mag_db.tolist()
 
-def decode_line_equalizer_coefficients(hex_string):
+def _decode_iq_s4_12(hex_string):
     """Decodes a hexadecimal string of 16-bit signed 4.12 fixed-point I/Q coefficients into a list of complex floats."""
-    coefficients = []
-    for i in range(0, len(hex_string), 8):
-        i_hex = hex_string[i:i+4]
-        q_hex = hex_string[i+4:i+8]
-        if len(q_hex) < 4:
-            continue
-        i_unsigned = np.uint16(int(i_hex, 16))
-        q_unsigned = np.uint16(int(q_hex, 16))
-        i_signed = i_unsigned.view(np.int16)
-        q_signed = q_unsigned.view(np.int16)
-        i_float = float(i_signed) / (2**12)
-        q_float = float(q_signed) / (2**12)
-        coefficients.append(complex(i_float, q_float))
-    return coefficients
+    # Each tap is 8 hex chars (big-endian int16 I then Q); a trailing partial tap is dropped.
+    usable = len(hex_string) - (len(hex_string) % 8)
+    iq = np.frombuffer(bytes.fromhex(hex_string[:usable]), dtype='>i2').reshape(-1, 2) / 2.0**12
+    return (iq[:, 0] + 1j * iq[:, 1]).tolist()
 
-def decode_peq_coefficients(hex_string):
-    """Decodes a hexadecimal string of 16-bit signed 4.12 fixed-point I/Q coefficients into a list of complex floats."""
-    coefficients = []
-    for i in range(0, len(hex_string), 8):
-        i_hex = hex_string[i:i+4]
-        q_hex = hex_string[i+4:i+8]
-        if len(q_hex) < 4:
-            continue
-        i_unsigned = np.uint16(int(i_hex, 16))
-        q_unsigned = np.uint16(int(q_hex, 16))
-        i_signed = i_unsigned.view(np.int16)
-        q_signed = q_unsigned.view(np.int16)
-        i_float = float(i_signed) / (2**12)
-        q_float = float(q_signed) / (2**12)
-        coefficients.append(complex(i_float, q_float))
-    return coefficients
+# Line EQ and PEQ coefficients share the same s4.12 I/Q encoding.
+decode_line_equalizer_coefficients = _decode_iq_s4_12
+decode_peq_coefficients = _decode_iq_s4_12
 
 def decode_shaping_filter_coefficients(hex_string: str) -> list[float]:
     """
@@ -66,8 +51,15 @@ def decode_shaping_filter_coefficients(hex_string: str) -> list[float]:
         logging.warning(f"Hex string length ({len(hex_string)}) is not a multiple of {chars_per_tap}. Decoding may be incomplete.")
 
     SCALING_FACTOR = 2.0**12
+    usable = num_taps * chars_per_tap
+    try:
+        taps = np.frombuffer(bytes.fromhex(hex_string[:usable]), dtype='>i4') / SCALING_FACTOR
+        return taps.tolist()
+    except ValueError:
+        # Malformed hex somewhere in the string; decode tap by tap so the valid taps survive.
+        pass
+
     coefficients = []
-    
     for i in range(num_taps):
         chunk = hex_string[i*chars_per_tap : (i+1)*chars_per_tap]
         try:
@@ -105,8 +97,8 @@ def analyze_psd_delta(full_freq, full_psd, target_psd):
     """Analyzes the delta between measured and target PSD to suggest adjustments."""
     if not full_freq or not full_psd:
         return None, None
-    delta = np.array(full_psd) - target_psd
-    freq_np = np.array(full_freq)
+    delta = np.asarray(full_psd, dtype=float) - target_psd
+    freq_np = np.asarray(full_freq, dtype=float)
     OPERATIONAL_START_MHZ = 108
     OPERATIONAL_END_MHZ = 684
     analysis_mask = (freq_np >= OPERATIONAL_START_MHZ) & (freq_np <= OPERATIONAL_END_MHZ)
@@ -119,7 +111,12 @@ def analyze_psd_delta(full_freq, full_psd, target_psd):
         if len(freq_filtered) < 2:
             logging.warning("Not enough data points for tilt analysis.")
             return None, None
-        slope, _ = np.polyfit(freq_filtered, delta_filtered, 1)
+        # Closed-form least-squares slope (degree-1 polyfit) on mean-centred data
+        freq_centred = freq_filtered - freq_filtered.mean()
+        freq_spread = np.dot(freq_centred, freq_centred)
+        slope = np.dot(freq_centred, delta_filtered - delta_filtered.mean()) / freq_spread if freq_spread > 0 else 0.0
+        if not np.isfinite(slope):
+            raise np.linalg.LinAlgError("degenerate regression")
     except (np.linalg.LinAlgError, TypeError):
         logging.warning("Could not perform linear regression on delta trace.")
         return None, None
@@ -134,6 +131,37 @@ def analyze_psd_delta(full_freq, full_psd, target_psd):
     suggested_atten_adjust = overall_delta - power_added_by_eq
     return suggested_eq_adjust, suggested_atten_adjust
 
+@functools.lru_cache(maxsize=64)
+def _load_sorted_s2p(path, mtime_ns, size):
+    """Parses an S2P/compensation file once per (path, mtime_ns, size) and returns it sorted by frequency.
+    The cached DataFrame is shared between callers and must be treated as read-only."""
+    s21_df = parsers.parse_s2p_data(path)
+    if s21_df is None:
+        return None
+    return s21_df.sort_values(by='Frequency')
+
+@functools.lru_cache(maxsize=64)
+def _interp_s2p_on_grid(path, mtime_ns, size, grid_bytes):
+    """Interpolates a cached S2P magnitude onto a WBFFT frequency grid (passed as raw float64 bytes so it can be a cache key)."""
+    s21_df = _load_sorted_s2p(path, mtime_ns, size)
+    if s21_df is None:
+        return None
+    interpolated = np.interp(np.frombuffer(grid_bytes, dtype=np.float64), s21_df['Frequency'], s21_df['S21_Magnitude'])
+    interpolated.flags.writeable = False
+    return interpolated
+
+def _interp_s2p(path, wbfft_freqs):
+    """Returns the S21 magnitude of an S2P/compensation file interpolated onto wbfft_freqs, or None if it cannot be read.
+    Repeated (file, grid) pairs reuse the earlier result while the file is unchanged."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        # Let the parser report the missing file as before.
+        parsers.parse_s2p_data(path)
+        return None
+    # Nanosecond mtime plus size catches a file rewritten within the same second
+    return _interp_s2p_on_grid(os.path.realpath(path), stat.st_mtime_ns, stat.st_size, np.ascontiguousarray(wbfft_freqs, dtype=np.float64).tobytes())
+
 def process_wbfft_data(local_wbfft_paths, hal_output, constants, output_dir, sanitized_mac=None):
     """Performs the full WBFFT post-processing analysis."""
     processed_data_frames = []
@@ -157,6 +185,7 @@ def process_wbfft_data(local_wbfft_paths, hal_output, constants, output_dir, san
 
         # Removed the +59.5 offset
         result_series = wbfft_df['Amplitude'].copy()
+        wbfft_freqs = wbfft_df['Frequency'].to_numpy()
 
         # Apply S2P corrections
         for s2p_key, operation in m_config['s2p_keys'].items():
@@ -168,10 +197,8 @@ def process_wbfft_data(local_wbfft_paths, hal_output, constants, output_dir, san
                 s2p_filename = f"{sanitized_mac}_{s2p_filename}"
 
             local_s2p_path = os.path.join(output_dir, s2p_filename)
-            s21_df = parsers.parse_s2p_data(local_s2p_path)
-            if s21_df is not None:
-                s21_df = s21_df.sort_values(by='Frequency')
-                interpolated_s21_mag = np.interp(wbfft_df['Frequency'], s21_df['Frequency'], s21_df['S21_Magnitude'])
+            interpolated_s21_mag = _interp_s2p(local_s2p_path, wbfft_freqs)
+            if interpolated_s21_mag is not None:
                 if operation == 'subtract': result_series -= interpolated_s21_mag
                 elif operation == 'add': result_series += interpolated_s21_mag
         
@@ -185,10 +212,8 @@ def process_wbfft_data(local_wbfft_paths, hal_output, constants, output_dir, san
                 comp_filename = f"{sanitized_mac}_{comp_filename}"
 
             local_comp_path = os.path.join(output_dir, comp_filename)
-            comp_df = parsers.parse_s2p_data(local_comp_path)
-            if comp_df is not None:
-                comp_df = comp_df.sort_values(by='Frequency')
-                interpolated_comp_mag = np.interp(wbfft_df['Frequency'], comp_df['Frequency'], comp_df['S21_Magnitude'])
+            interpolated_comp_mag = _interp_s2p(local_comp_path, wbfft_freqs)
+            if interpolated_comp_mag is not None:
                 if operation == 'subtract': result_series -= interpolated_comp_mag
                 elif operation == 'add': result_series += interpolated_comp_mag
 
@@ -218,32 +243,49 @@ def _parse_freq_string(s):
         logging.error(f"Could not parse frequency value: {s}")
         return None
 
-def _calculate_power_for_single_column(df, column_name, channel_definitions):
+def _calculate_power_for_columns(df, column_names, channel_definitions):
     """
-    Calculates channel power for a single measurement column.
+    Calculates channel power for all measurement columns at once.
     Logic is based directly on the provided WBFFT_DS_Analyzer_v2.0.5.py script.
+    Results are grouped by column, in column order, each tagged with its 'Measurement'.
     """
     power_results = []
-    if df.empty:
+    if df.empty or not column_names:
         return power_results
 
-    for channel in channel_definitions:
-        cf_hz, bw_hz = channel['cf_hz'], channel['bw_hz']
-        start_freq, end_freq = cf_hz - (bw_hz / 2.0), cf_hz + (bw_hz / 2.0)
-        
-        channel_df = df[(df['Frequency'] >= start_freq) & (df['Frequency'] < end_freq)]
-        
-        power_dBmV = -math.inf
-        if not channel_df.empty and not channel_df[column_name].isnull().all():
-            linear_power = 10**(channel_df[column_name].dropna() / 10)
-            total_linear_power = linear_power.sum()
-            if total_linear_power > 0:
-                power_dBmV = 10 * math.log10(total_linear_power)
-
-        power_results.append({
-            'CenterFrequency_MHz': float(f"{cf_hz/1e6:.3f}"),
-            'Channel_Power_dBmV': power_dBmV
-        })
+    freq = df['Frequency'].to_numpy(dtype=float)
+    values = df[column_names].to_numpy(dtype=float)
+    if np.any(np.diff(freq) < 0):
+        order = np.argsort(freq, kind='stable')
+        freq, values = freq[order], values[order]
+    # One NaN mask for the whole matrix, reused by every channel below
+    is_nan = np.isnan(values)
+    with np.errstate(over='ignore'):
+        linear_power = np.where(is_nan, 0.0, 10**(values / 10))
+
+    # Channel edges as [start, end) index ranges into the sorted frequency axis
+    cf_hz = np.array([channel['cf_hz'] for channel in channel_definitions], dtype=float)
+    half_bw_hz = np.array([channel['bw_hz'] for channel in channel_definitions], dtype=float) / 2.0
+    lo_idx = np.searchsorted(freq, cf_hz - half_bw_hz, side='left')
+    hi_idx = np.searchsorted(freq, cf_hz + half_bw_hz, side='left')
+
+    # power_dBmV[channel, column]; empty or all-NaN channels stay at -inf
+    power_dBmV = np.full((len(channel_definitions), len(column_names)), -math.inf)
+    for i, (lo, hi) in enumerate(zip(lo_idx, hi_idx)):
+        if hi <= lo:
+            continue
+        total_linear_power = linear_power[lo:hi].sum(axis=0)
+        has_power = ~is_nan[lo:hi].all(axis=0) & (total_linear_power > 0)
+        power_dBmV[i, has_power] = 10 * np.log10(total_linear_power[has_power])
+
+    cf_mhz = [float(f"{channel['cf_hz']/1e6:.3f}") for channel in channel_definitions]
+    for j, col in enumerate(column_names):
+        for i, cf in enumerate(cf_mhz):
+            power_results.append({
+                'CenterFrequency_MHz': cf,
+                'Channel_Power_dBmV': float(power_dBmV[i, j]),
+                'Measurement': col
+            })
     return power_results
 
 def calculate_channel_power(df, channels_str):
@@ -251,18 +293,16 @@ def calculate_channel_power(df, channels_str):
     Parses channel definitions and orchestrates channel power calculation for all measurement columns.
     """
     channel_definitions = []
-    range_pattern = re.compile(r"([\d\.]+[KMG]?)-([\d\.]+[KMG]?)\(([\d\.]+[KMG]?)\)")
-    single_pattern = re.compile(r"([\d\.]+[KMG]?)\(([\d\.]+[KMG]?)\)")
     for definition in channels_str.split(','):
         definition = definition.strip()
-        if match := range_pattern.match(definition):
+        if match := _RANGE_RE.match(definition):
             start_hz, stop_hz, step_hz = map(_parse_freq_string, match.groups())
             if any(v is None for v in [start_hz, stop_hz, step_hz]): continue
             current_cf = start_hz
             while current_cf <= stop_hz:
                 channel_definitions.append({'cf_hz': current_cf, 'bw_hz': step_hz})
                 current_cf += step_hz
-        elif match := single_pattern.match(definition):
+        elif match := _SINGLE_RE.match(definition):
             cf_hz, bw_hz = map(_parse_freq_string, match.groups())
             if cf_hz is not None and bw_hz is not None:
                 channel_definitions.append({'cf_hz': cf_hz, 'bw_hz': bw_hz})
@@ -272,13 +312,4 @@ def calculate_channel_power(df, channels_str):
         return []
 
     measurement_cols = [col for col in df.columns if col != 'Frequency']
-    
-    all_power_results = []
-    for col in measurement_cols:
-        col_results = _calculate_power_for_single_column(df[['Frequency', col]], col, channel_definitions)
-        
-        for result in col_results:
-            result['Measurement'] = col
-            all_power_results.append(result)
-            
-    return all_power_results
\ No newline at end of file
+    return _calculate_power_for_columns(df, measurement_cols, channel_definitions)
\ No newline at end of file
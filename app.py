@@ -20,42 +20,56 @@ import sys
 import os
 import macaddress
 import json
-import ast
 from datetime import datetime
 import re
 import threading
+import time
+import concurrent.futures
+import functools
+import signal
 import tkinter as tk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 # from ttkbootstrap.scrolledtext import ScrolledText
 import tkinter.messagebox as messagebox
 import tkinter.font as tkfont
+from amp_info import get_amp_info
 
 parser = argparse.ArgumentParser(description="AmpPoll - amplifier polling for multiple measurement points.")
 parser.add_argument('--addr', type=str, help="Optional. Specify either IP or MAC address of the target device. Overrides the value in config.")
 args = parser.parse_args()
 
+# Syntactic gates for address validation; they match exactly the MAC notations macaddress.MAC
+# accepts (aa-bb-.., aa:bb:.., aabb.ccdd.eeff, aabbccddeeff), and only plausible IPv6 text is
+# handed to ipaddress, so typical invalid input never goes through a raise/catch.
+_MAC_RE = re.compile(r'[0-9A-Fa-f]{2}([:-])[0-9A-Fa-f]{2}(?:\1[0-9A-Fa-f]{2}){4}|[0-9A-Fa-f]{12}|[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}\.[0-9A-Fa-f]{4}')
+_IPV6_GATE = re.compile(r'[0-9A-Fa-f:.]*:[0-9A-Fa-f:.]*(%.*)?')
+# Separators/whitespace stripped from a MAC when it is used in the output path
+_MAC_SANITIZE = re.compile(r'[:\-_\s]+')
 
+# Seconds an amp_info lookup is reused for repeated submits on the same address
+AMP_INFO_TTL = 60
+
+# Helper scripts live next to this file
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_WBFFT = os.path.join(_HERE, 'wbfft_v2.py')
+_EC = os.path.join(_HERE, 'ec.py')
+
+
+@functools.lru_cache(maxsize=1024)
 def is_valid_addr(value: str) -> bool:
 	"""Return True if value is a valid MAC or IPv6 address."""
 	if not value:
 		return False
-	try:
-		# Try MAC first
-		macaddress.MAC(value)
-		return True
-	except Exception:
-		pass
-	try:
-		ipaddress.IPv6Address(value)
+	if _MAC_RE.fullmatch(value):
 		return True
-	except Exception:
-		return False
+	return is_ipv6(value)
 
 
+@functools.lru_cache(maxsize=1024)
 def is_ipv6(value: str) -> bool:
     """Return True if `value` is a valid IPv6 address."""
-    if not value:
+    if not value or not _IPV6_GATE.fullmatch(value):
         return False
     try:
         ipaddress.IPv6Address(value)
@@ -64,6 +78,33 @@ def is_ipv6(value: str) -> bool:
         return False
 
 
+# Start helper scripts in their own process group/session so a timeout can take down
+# anything they spawned, not just the direct child.
+if os.name == 'nt':
+	_NEW_PROCESS_GROUP = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+	_NEW_PROCESS_GROUP = {'start_new_session': True}
+
+
+def kill_process_group(proc):
+	"""Forcefully stop a child started with _NEW_PROCESS_GROUP together with its descendants."""
+	try:
+		if os.name == 'nt':
+			subprocess.run(['taskkill', '/F', '/T', '/PID', str(proc.pid)], capture_output=True)
+		else:
+			os.killpg(proc.pid, signal.SIGKILL)
+	except OSError:
+		pass
+	# Make sure the direct child is gone even if the group kill failed
+	if proc.poll() is None:
+		proc.kill()
+
+
+# Tk named fonts switched to the custom family at launch
+_FONT_NAMES = ('TkDefaultFont', 'TkTextFont', 'TkFixedFont', 'TkMenuFont', 'TkHeadingFont',
+			   'TkCaptionFont', 'TkSmallCaptionFont', 'TkIconFont', 'TkTooltipFont')
+
+
 def launch_gui():
 	# Create root window with ttkbootstrap yeti theme
 	root = tb.Window(themename='yeti')
@@ -71,19 +112,11 @@ def launch_gui():
 	icon_png_path = os.path.join(os.getcwd(), 'resources/icons/icon-128.png')
 	# root.state('zoomed')  # Maximize window on Windows
 
-	# Register and set custom font as default
-	font_path = os.path.join(os.getcwd(), 'resources', 'fonts', 'ComcastNewVision.otf')
+	# Set custom font as default, but only if the family is actually installed
 	try:
-		if os.path.exists(font_path):
-			tkfont.nametofont('TkDefaultFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkTextFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkFixedFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkMenuFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkHeadingFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkCaptionFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkSmallCaptionFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkIconFont').configure(family='ComcastNewVision')
-			tkfont.nametofont('TkTooltipFont').configure(family='ComcastNewVision')
+		if 'ComcastNewVision' in tkfont.families(root):
+			for name in _FONT_NAMES:
+				tkfont.nametofont(name).configure(family='ComcastNewVision')
 	except Exception:
 		pass
 
@@ -219,6 +252,8 @@ def launch_gui():
 		for var in task_vars.values():
 			var.set(False)
 		addr_var.set('')
+		amp_info_futures.clear()
+		amp_info_cache.clear()
 		clear_output()
 		set_status('Cleared', ok=True)
 
@@ -234,53 +269,98 @@ def launch_gui():
 	# Spinner animation setup
 	spinner_frames = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
 	spinner_idx = [0]
+	spinner_after_id = [None]
 
 	def animate_spinner():
-		if spinner_var.get() != '':  # Only animate if we're in spinner mode
-			spinner_idx[0] = (spinner_idx[0] + 1) % len(spinner_frames)
-			spinner_var.set(spinner_frames[spinner_idx[0]])
-			root.after(100, animate_spinner)
+		spinner_idx[0] = (spinner_idx[0] + 1) % len(spinner_frames)
+		spinner_var.set(spinner_frames[spinner_idx[0]])
+		spinner_after_id[0] = root.after(125, animate_spinner)
 
 	def stop_spinner():
+		# Cancel the pending frame so no callback fires after the run has finished
+		if spinner_after_id[0] is not None:
+			root.after_cancel(spinner_after_id[0])
+			spinner_after_id[0] = None
 		spinner_var.set('')
 		spinner_idx[0] = 0
 
+	# Recent successful lookups, addr -> (monotonic timestamp, (parsed, raw_out)); cleared on Reset
+	amp_info_cache = {}
+
 	def run_amp_info(image, addr):
-		cmd = [sys.executable, os.path.join(os.path.dirname(__file__), 'amp_info.py'), 'PROD', 'CPE', addr]
-		env = os.environ.copy()
-		# set_status('Running Amp Info...', ok=True)
-		# append_output(f'Running: {" ".join(cmd)}')
+		now = time.monotonic()
+		hit = amp_info_cache.get(addr)
+		if hit and now - hit[0] < AMP_INFO_TTL:
+			return hit[1]
+		# Look the address up in-process; amp_info bounds each of its helper scripts with a timeout
 		try:
-			proc = subprocess.run(cmd, capture_output=True, text=True, env=env, timeout=60)
-			raw_out = proc.stdout.strip() if proc.stdout else ''
-			# raw_err = proc.stderr.strip() if proc.stderr else ''
-			if proc.returncode != 0:
-				# append_output(raw_err or raw_out or f'return code {proc.returncode}')
-				# set_status('Error running Amp Info', ok=False)
-				return None, raw_out
-			# try to parse output as JSON first, then as Python literal
-			parsed = None
-			if raw_out:
-				try:
-					parsed = json.loads(raw_out)
-				except Exception:
-					try:
-						parsed = ast.literal_eval(raw_out)
-					except Exception:
-						parsed = None
-
-			# append_output(raw_out or '(no output)')
-			# set_status('Amp Info completed', ok=True)
-			return parsed, raw_out
-
-		except subprocess.TimeoutExpired:
-			# append_output('Amp Info timed out')
-			# set_status('Timeout', ok=False)
-			return None, ''
+			parsed = get_amp_info('PROD', 'CPE', addr)
 		except Exception as e:
-			# append_output(f'Execution error: {e}')
+			# append_output(f'Amp Info error: {e}')
 			# set_status('Execution error', ok=False)
 			return None, ''
+		raw_out = json.dumps(parsed) if parsed else ''
+		if parsed:
+			amp_info_cache[addr] = (now, (parsed, raw_out))
+		return parsed, raw_out
+
+	# Prefetch amp_info in the background once the address field settles on a valid address,
+	# so the lookup overlaps with the user picking tasks instead of running after Submit.
+	# addr -> (monotonic start time, future); entries older than AMP_INFO_TTL are dropped unused.
+	amp_info_futures = {}
+	prefetch_after_id = [None]
+
+	def prune_amp_info_futures(now):
+		for addr in [addr for addr, (started, _) in amp_info_futures.items() if now - started >= AMP_INFO_TTL]:
+			del amp_info_futures[addr]
+
+	def prefetch_amp_info():
+		prefetch_after_id[0] = None
+		now = time.monotonic()
+		prune_amp_info_futures(now)
+		addr = addr_var.get().strip()
+		if not addr or addr in amp_info_futures or not is_valid_addr(addr):
+			return
+		future = concurrent.futures.Future()
+		amp_info_futures[addr] = (now, future)
+		image = image_var.get()
+
+		def lookup():
+			try:
+				future.set_result(run_amp_info(image, addr))
+			except BaseException as e:
+				# settle the future either way so Submit never waits on a dead lookup
+				future.set_exception(e)
+
+		# daemon thread (like the submit worker) so a pending lookup never delays closing the app
+		threading.Thread(target=lookup, daemon=True).start()
+
+	def schedule_prefetch(*_):
+		if prefetch_after_id[0] is not None:
+			root.after_cancel(prefetch_after_id[0])
+		prefetch_after_id[0] = root.after(500, prefetch_amp_info)
+
+	addr_var.trace_add('write', schedule_prefetch)
+
+	# Validate the address once typing pauses rather than on every keystroke
+	validate_after_id = [None]
+
+	def validate_addr():
+		validate_after_id[0] = None
+		addr = addr_var.get().strip()
+		if not addr:
+			return
+		if is_valid_addr(addr):
+			set_status('Ready', ok=True)
+		else:
+			set_status('Invalid address', ok=False)
+
+	def schedule_validate(*_):
+		if validate_after_id[0] is not None:
+			root.after_cancel(validate_after_id[0])
+		validate_after_id[0] = root.after(200, validate_addr)
+
+	addr_var.trace_add('write', schedule_validate)
 
 	def on_submit(event=None):
 		image = image_var.get()
@@ -301,6 +381,10 @@ def launch_gui():
 			set_status('No tasks selected', ok=False)
 			return
 		
+		# Reuse the background lookup for this address if one was started recently enough
+		prune_amp_info_futures(time.monotonic())
+		prefetched = amp_info_futures.pop(addr, (None, None))[1]
+
 		# Disable submit button and start spinner
 		submit_btn.config(state='disabled')
 		clear_output()
@@ -310,27 +394,32 @@ def launch_gui():
 		# Run submission in background thread
 		def run_submission():
 			try:
-				on_submit_worker(image, addr, selected_tasks)
+				on_submit_worker(image, addr, selected_tasks, prefetched)
 			finally:
 				# Stop spinner and re-enable button on main thread
-				root.after(0, lambda: spinner_var.set(''))
+				root.after(0, stop_spinner)
 				root.after(0, lambda: submit_btn.config(state='normal'))
 				root.after(0, lambda: addr_entry.focus())
 		
 		thread = threading.Thread(target=run_submission, daemon=True)
 		thread.start()
 
-	def on_submit_worker(image, addr, selected_tasks_list):
-		parsed, raw = run_amp_info(image, addr)
+	def on_submit_worker(image, addr, selected_tasks_list, prefetched=None):
+		try:
+			parsed, raw = prefetched.result() if prefetched else run_amp_info(image, addr)
+		except Exception:
+			# the background lookup failed; look the address up again now
+			parsed, raw = run_amp_info(image, addr)
 
-		# Determine IP to use for subsequent calls
-		ip_to_use = None
+		# Determine IP to use for subsequent calls: a submitted IPv6 literal is used as-is,
+		# amp_info is then only needed for cmMacAddr/fnName
+		ip_to_use = addr if is_ipv6(addr) else None
 		cm_mac_val = None
 		fn_name_val = None
 
 		if isinstance(parsed, dict):
 			# check for cpeIpv6Addr or cmMacAddr keys
-			if 'cpeIpv6Addr' in parsed and parsed.get('cpeIpv6Addr'):
+			if not ip_to_use and parsed.get('cpeIpv6Addr'):
 				ip_to_use = parsed.get('cpeIpv6Addr')
 			if 'cmMacAddr' in parsed and parsed.get('cmMacAddr'):
 				cm_mac_val = parsed.get('cmMacAddr')
@@ -338,14 +427,6 @@ def launch_gui():
 			if 'fnName' in parsed and parsed.get('fnName'):
 				fn_name_val = parsed.get('fnName')
 
-		# If amp_info returned cmMacAddr, use the submitted ipv6 address as ip
-		if cm_mac_val and is_ipv6(addr):
-			ip_to_use = addr
-
-		# If no ip found but submitted addr is IPv6, use it
-		if not ip_to_use and is_ipv6(addr):
-			ip_to_use = addr
-
 		# Build fnName string: fnName + '/' + cmMacAddr_or_submitted_mac + '/' + YYYYMMDD
 		date_str = datetime.now().strftime('%Y-%m-%d_%H-%M')
 		mac_for_fn = cm_mac_val
@@ -360,7 +441,7 @@ def launch_gui():
 
 		# sanitize mac: remove :, -, _, and spaces
 		if mac_for_fn:
-			mac_for_fn = re.sub(r'[:\-_\s]+', '', str(mac_for_fn))
+			mac_for_fn = _MAC_SANITIZE.sub('', str(mac_for_fn))
 
 		fn_components = []
 		if fn_name_val:
@@ -374,26 +455,38 @@ def launch_gui():
 		# If we have an IP, call wbfft_v2.py with --mac and --ip
 		if ip_to_use:
 			set_status('Working on it', ok=True)
-			env = os.environ.copy()
-			env['IMAGE'] = image
-
-			# Get selected tasks and build task argument
-			task_arg = ' '.join(selected_tasks_list)
+			env = {**os.environ, 'IMAGE': image}
 
 			# wbfft_2.py
 			# python wbfft_v2.py 24:a1:86:1d:da:90 --ip 2001:558:6026:32:912b:2704:46eb:f4 --task showModuleInfo get_wbfft get_ec
 			try:
-				wbfft_path = os.path.join(os.path.dirname(__file__), 'wbfft_v2.py')
-				# Build a single command string with quoted arguments
-				wbfft_cmd_str = f'"{sys.executable}" "{wbfft_path}" --mac "{mac_for_fn}" --ip "{ip_to_use}" --image "{image}" --output "{fn_name_string}" --task {task_arg}'
-				append_output(f'Running: {wbfft_cmd_str}')
+				# Pass argv directly (no shell): no extra cmd.exe process and no quoting layer
+				wbfft_cmd = [sys.executable, _WBFFT, '--mac', str(mac_for_fn), '--ip', ip_to_use, '--image', image,
+							 '--output', fn_name_string, '--task', *selected_tasks_list]
+				append_output(f'Running: {subprocess.list2cmdline(wbfft_cmd)}')
 				
-				wb = subprocess.run(wbfft_cmd_str, capture_output=True, text=True, env=env, timeout=180, shell=True)
-				if wb.returncode == 0:
-					append_output(wb.stdout.strip() or '(no output)')
-				
-				else:
-					append_output(wb.stderr.strip() or wb.stdout.strip() or f'wbfft returned {wb.returncode}')
+				# There is no output pane to show the child's output in, so it is discarded rather than
+				# buffered in a pipe; wbfft_v2 writes its own logs and reports
+				wb = subprocess.Popen(wbfft_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+									  env=env, **_NEW_PROCESS_GROUP)
+				# Watchdog timer rather than wait(timeout=...): it fires independently of pipe state (bpo-43346)
+				timed_out = threading.Event()
+
+				def on_timeout():
+					timed_out.set()
+					kill_process_group(wb)
+
+				watchdog = threading.Timer(180, on_timeout)
+				watchdog.daemon = True
+				watchdog.start()
+				try:
+					returncode = wb.wait()
+				finally:
+					watchdog.cancel()
+				if timed_out.is_set():
+					append_output('wbfft timed out after 180s')
+				if returncode != 0:
+					append_output(f'wbfft returned {returncode}')
 			
 			except Exception as e:
 				append_output(f'wbfft execution error: {e}')
@@ -401,11 +494,10 @@ def launch_gui():
 
 			# ec.py
 			# try:
-			# 	ec_path = os.path.join(os.path.dirname(__file__), 'ec.py')
-			# 	ec_cmd_str = f'"{sys.executable}" "{ec_path}" --image "{image}" --ip "{ip_to_use}" --path "{fn_name_string}"'
-			# 	append_output(f'Running: {ec_cmd_str}')
+			# 	ec_cmd = [sys.executable, _EC, '--image', image, '--ip', ip_to_use, '--path', fn_name_string]
+			# 	append_output(f'Running: {subprocess.list2cmdline(ec_cmd)}')
 			# 	update_script_status('ec.py', 'Running...', ok=True)
-			# 	ecproc = subprocess.run(ec_cmd_str, capture_output=True, text=True, env=env, timeout=300, shell=True)
+			# 	ecproc = subprocess.run(ec_cmd, capture_output=True, text=True, env=env, timeout=300)
 			# 	if ecproc.returncode == 0:
 			# 		append_output(ecproc.stdout.strip() or '(no output)')
 			# 		update_script_status('ec.py', 'Completed', ok=True)
@@ -1,198 +1,310 @@
+import copy
+import json
+from collections.abc import Mapping
 import verifiers
 import parsers
 
+# Settings sections that feed into the command sequences
+_SEQUENCE_SECTIONS = ("General settings", "spectrum", "ds-profile", "us-profile", "upgradefw", "north-afe-backoff", "atten-and-eq")
+
+# Steps shared verbatim by several sequences. Callers deep-copy a sequence before running it,
+# so one dict per step can be referenced from every sequence that uses it.
+EXIT_STEP = {'command': 'exit', 'validation_string': None}
+COMMIT_LOCAL_STEP = {'command': 'commit', 'validation_string': 'applied local configuration'}
+SPECTRUM_STEP = {'command': 'configure spectrum', 'validation_string': 'spectrum-allocation', 'delay_before_prompt': 1.5}
+DS_PROFILE_STEP = {'command': "configure ds-profile south", 'validation_string': 'ds-profile-south', 'delay_before_prompt': 1.5}
+US_PROFILE_STEP = {'command': "configure us-profile south", 'validation_string': 'us-profile-south', 'delay_before_prompt': 1.5}
+NORTH_PORT_STEP = {'command': "configure north-port", 'validation_string': "north-port", 'delay_before_prompt': 1.5}
+RF_COMPONENTS_STEP = {'command': "rf-components", 'validation_string': None}
+
+# Registries keyed by the settings sections and prompt markers they were built from.
+# Callers deep-copy each step before running it, so a built sequence can be handed out as-is.
+_SEQ_CACHE = {}
+
 def generate_command_sequences(settings, constants):
-    """Dynamically builds the command sequences from the settings file."""
-    
-    general_settings = settings.get("General settings", {})
-    upgradefw_timeout = general_settings.get("upgradefw_timeout", 600)
-    alignment_timeout = general_settings.get("alignment_timeout", 120)
+    """Returns the command sequences for the settings file, reusing a previous registry for identical settings."""
+    sections = {section: settings.get(section, {}) for section in _SEQUENCE_SECTIONS}
+    key = json.dumps([sections, constants.PROMPT_MARKERS], sort_keys=True, default=str)
+    sequences = _SEQ_CACHE.get(key)
+    if sequences is None:
+        sequences = _SEQ_CACHE[key] = SequenceRegistry(copy.deepcopy(sections), dict(constants.PROMPT_MARKERS))
+    return sequences
+
+
+class SequenceRegistry(Mapping):
+    """Read-only mapping of task name to command sequence; each sequence is built the first time it is requested."""
+
+    def __init__(self, settings, prompt_markers):
+        self._settings = settings
+        self._markers = prompt_markers
+        self._built = {}
+
+    def __getitem__(self, task_name):
+        sequence = self._built.get(task_name)
+        if sequence is None:
+            builder = _SEQUENCE_BUILDERS[task_name]
+            sequence = self._built[task_name] = builder(self._settings, self._markers)
+        return sequence
+
+    def __iter__(self):
+        return iter(_SEQUENCE_BUILDERS)
 
+    def __len__(self):
+        return len(_SEQUENCE_BUILDERS)
+
+
+def _build_spectrum(settings, markers):
     spec_settings = settings.get("spectrum", {})
-    ds_settings = settings.get("ds-profile", {})
-    us_settings = settings.get("us-profile", {})
-    upgradefw_settings = settings.get("upgradefw", {})
-    backoff_settings = settings.get("north-afe-backoff", {})
-    atteneq_settings = settings.get("atten-and-eq", {})
 
-    spectrum_sequence = [{'command': 'configure spectrum', 'validation_string': 'spectrum-allocation', 'delay_before_prompt': 1.5}]
-    if spec_settings.get("us-extended-end-freq", "") != "":
-        spectrum_sequence.append({'command': f"us-extended-end-freq {spec_settings['us-extended-end-freq']}", 'validation_string': 'is set from'})
-    if spec_settings.get("subband_0_mode", "") != "":
-        spectrum_sequence.append({'command': f"subband 0 {spec_settings['subband_0_mode']}", 'validation_string': 'is set from'})
-    if spec_settings.get("subband_1_mode", "") != "":
-        spectrum_sequence.append({'command': f"subband 1 {spec_settings['subband_1_mode']}", 'validation_string': 'is set from'})
-    if spec_settings.get("subband_2_mode", "") != "":
-        spectrum_sequence.append({'command': f"subband 2 {spec_settings['subband_2_mode']}", 'validation_string': 'is set from'})
+    spectrum_sequence = [SPECTRUM_STEP]
+    us_extended_end_freq = spec_settings.get("us-extended-end-freq", "")
+    if us_extended_end_freq != "":
+        spectrum_sequence.append({'command': f"us-extended-end-freq {us_extended_end_freq}", 'validation_string': 'is set from'})
+    for subband in (0, 1, 2):
+        mode = spec_settings.get(f"subband_{subband}_mode", "")
+        if mode != "":
+            spectrum_sequence.append({'command': f"subband {subband} {mode}", 'validation_string': 'is set from'})
 
     spectrum_sequence.extend([
         {'command': 'commit', 'validation_string': 'spectrum allocation is saved in non-vol memory'},
-																																																	  
         {'command': 'configure ds-freq-override', 'validation_string': None}
     ])
 
     if spec_settings.get('ds_override_enabled', True):
         spectrum_sequence.append({'command': 'enabled true', 'validation_string': ['FDX RepeaterSettings block added', 'FDX RepeaterSettings block already present']})
-        if spec_settings.get("ds-start-freq-cc", "") != "":
-            spectrum_sequence.append({'command': f"ds-start-freq-cc {spec_settings['ds-start-freq-cc']}", 'validation_string': 'DownstreamStartFreqHzCC set to'})
+        ds_start_freq_cc = spec_settings.get("ds-start-freq-cc", "")
+        if ds_start_freq_cc != "":
+            spectrum_sequence.append({'command': f"ds-start-freq-cc {ds_start_freq_cc}", 'validation_string': 'DownstreamStartFreqHzCC set to'})
     else:
         spectrum_sequence.append({'command': 'enabled false', 'validation_string': ['FDX RepeaterSettings block removed', 'FDX RepeaterSettings block is not present']})
-    
+
     spectrum_sequence.extend([
         {'command': 'commit', 'validation_string': 'Checksum matches. Configuration committed.'},
-																																						
-        {'command': 'exit', 'validation_string': None}
+        EXIT_STEP
     ])
+    return spectrum_sequence
 
-    rf_components_sequence = [{'command': "rf-components", 'validation_string': None}]
-    if atteneq_settings.get("legacy-input-atten", "") != "":
-        rf_components_sequence.append({'command': f"legacy-us-input-atten main {atteneq_settings['legacy-input-atten']}", 'validation_string': 'main legacy-us-input-atten is set from'})
-    if atteneq_settings.get("ds-output-atten", "") != "":
-        rf_components_sequence.append({'command': f"ds-output-atten {atteneq_settings['ds-output-atten']}", 'validation_string': 'ds-output-attenuation-db is set from'})
-    if atteneq_settings.get("ds-output-eq", "") != "":
-        rf_components_sequence.append({'command': f"ds-output-eq {atteneq_settings['ds-output-eq']}", 'validation_string': 'ds-output-eq-db is set from'})
-    if atteneq_settings.get("us-fdx-atten", "") != "":
-        rf_components_sequence.append({'command': f"us-fdx-atten {atteneq_settings['us-fdx-atten']}", 'validation_string': 'us-fdx-attenuation-db is set from'})
-    if atteneq_settings.get("us-fdx-eq", "") != "":
-        rf_components_sequence.append({'command': f"us-fdx-eq {atteneq_settings['us-fdx-eq']}", 'validation_string': 'us-fdx-equalization-db is set from'})
-    
-    rf_components_sequence.extend([
-																																												   
-        {'command': 'exit', 'validation_string': None}
-    ])
 
-    sequences = {
-        "showModuleInfo": [{'command': 'showModuleInfo', 'parser': parsers.parse_module_info}],
-        "show_spectrum": [
-            {'command': 'configure spectrum', 'validation_string': 'spectrum-allocation', 'delay_before_prompt': 1.5},
-            {'command': 'show configuration', 'parser': parsers.parse_spectrum_config, 'wait_for_string': '-----------------------------------------'},
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "show_ds-profile":[
-            {'command': f"configure ds-profile south", 'validation_string': 'ds-profile-south', 'delay_before_prompt': 1.5},
-            {'command': 'show configuration', 'parser': parsers.parse_ds_profile_config, 'wait_for_string': '------------------------------------------'},
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "show_us-profile":[
-            {'command': f"configure us-profile south", 'validation_string': 'us-profile-south', 'delay_before_prompt': 1.5},
-            {'command': 'show configuration', 'parser': parsers.parse_us_profile_config, 'wait_for_string': '------------------------------------------'},
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "show_north-afe-backoff":[
-            {'command': "configure north-port", 'validation_string': "north-port", 'delay_before_prompt': 1.5},
-            {'command': 'show configuration', 'parser': parsers.parse_backoff_config, 'wait_for_string': '-----------------------------------------'},
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "show_rf_components": [
-            {'command': "rf-components", 'validation_string': None},
-            {'command': 'show rf-components', 'parser': parsers.parse_rf_components_config, 'wait_for_string': 'pa-bias'},
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "show_alignment": [
-            {'command': 'configure alignment', 'validation_string': None},
-            {'command': 'show alignment-status', 'parser': parsers.parse_alignment_status, 'wait_for_string': 'NET:'},
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "show_fafe": [
-            {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
-            {'command': '/leap/fafe_show_status 0', 'parser': parsers.parse_afe_status, 'wait_for_string': 'NcInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'clip_key': 'NcClipCount'},
-            {'command': '/leap/fafe_show_status 4', 'parser': parsers.parse_afe_status, 'wait_for_string': 'NcInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'clip_key': 'NcClipCount'},
-            {'command': '/leap/lafe_show_status 0', 'parser': parsers.parse_afe_status, 'wait_for_string': 'RxInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'clip_key': 'RxClipCount'},
-            {'command': '/leap/lafe_show_status 4', 'parser': parsers.parse_afe_status, 'wait_for_string': 'RxInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'clip_key': 'RxClipCount'},
-            {'command': '/leap/lafe_show_status 5', 'parser': parsers.parse_afe_status, 'wait_for_string': 'RxInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'clip_key': 'RxClipCount'},
-            {'command': '\x04\n', 'validation_string': None, 'prompt_marker': constants.PROMPT_MARKERS['default']}
-        ],
-        "get_nc_input_power": [
-            {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
-            {'command': '/leap/fafe_show_status 4', 'parser': parsers.parse_afe_status, 'wait_for_string': 'NcInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '\x04\n', 'validation_string': None, 'prompt_marker': constants.PROMPT_MARKERS['default']}
-        ],
-        "configure_spectrum": spectrum_sequence,
-        "configure_ds-profile":[
-            {'command': f"configure ds-profile south", 'validation_string': 'ds-profile-south', 'delay_before_prompt': 1.5},
-            {'command': f"start-freq {ds_settings.get('start-freq', '')}", 'validation_string': 'min-frequency-hertz" is set from'},
-            {'command': f"end-freq {ds_settings.get('end-freq', '')}", 'validation_string': 'max-frequency-hertz" is set from'},
-            {'command': f"start-power {round(float(ds_settings.get('start-power', 0)), 1)}", 'validation_string': '"ds-power-min-freq-dbmv" is set from'},
-            {'command': f"end-power {round(float(ds_settings.get('end-power', 0)), 1)}", 'validation_string': 'ds-power-max-freq-dbmv'},
-            {'command': 'commit', 'validation_string': 'applied local configuration'},
-																																																		   
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "commit_ds-profile":[
-            {'command': f"configure ds-profile south", 'validation_string': 'ds-profile-south', 'delay_before_prompt': 1.5},
-            {'command': 'commit', 'validation_string': 'applied local configuration'},
-																																																		   
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "configure_us-profile":[
-            {'command': f"configure us-profile south", 'validation_string': 'us-profile-south', 'delay_before_prompt': 1.5},
-            {'command': f"rlsp {us_settings.get('rlsp', '')}", 'validation_string': 'rlsp is set from'},
-            {'command': 'commit', 'validation_string': 'applied local configuration'},
-																																																		   
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "commit_us-profile":[
-            {'command': f"configure us-profile south", 'validation_string': 'us-profile-south', 'delay_before_prompt': 1.5},
-            {'command': 'commit', 'validation_string': 'applied local configuration'},
-																																																		   
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "run_alignment":[
-            {'command': "configure alignment", 'validation_string': None, 'prompt_marker': constants.PROMPT_MARKERS['default']},
-            {'command': "start-ds1", 'validation_string': 'Completed DS1 alignment', 'prompt_marker': constants.PROMPT_MARKERS['default'], 'timeout': alignment_timeout},
-            {'command': 'start-ds2', 'validation_string': 'Completed DS2 alignment', 'prompt_marker': constants.PROMPT_MARKERS['default'], 'timeout': alignment_timeout},
-            {'command': 'start-ds3', 'validation_string': 'Completed DS3 alignment', 'prompt_marker': constants.PROMPT_MARKERS['default'], 'timeout': alignment_timeout},
-            {'command': 'start-us', 'validation_string': 'Completed US alignment', 'prompt_marker': constants.PROMPT_MARKERS['default'], 'timeout': alignment_timeout},
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "reset":[ {'command': "reset", 'validation_string': "reset"} ],
-        "upgradefw":[ {'command': f"upgradefw http {upgradefw_settings.get('host', '')} {upgradefw_settings.get('filename', '')}", 'validation_string': "Successfully upgraded the image", 'timeout': upgradefw_timeout} ],
-        "generate_key":[ {'command': "configure crypto key generate rsa", 'validation_string': "SSH host rsa private key has beensuccessfully imported."} ],
-        "configure_north-afe-backoff":[
-            {'command': "configure north-port", 'validation_string': "north-port", 'delay_before_prompt': 1.5},
-            {'command': f"north-afe-backoff {backoff_settings.get('backoff', '')}", 'validation_string': 'north-afe-backoff-db is set from'},
-            {'command': 'commit', 'validation_string': 'north-port param is saved in non-vol memory'},
-																																																			
-            {'command': 'exit', 'validation_string': None}
-        ],
-        "configure_rf_components": rf_components_sequence,
-        "tg_start":[
-            {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
-            {'command': '/usrptr/write_ofdma 0x15c4   0x0', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15c8   0x0', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15cc   0x1000000', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15d0   0x9077800', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15d4   0x7f0', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x181a44 0x40000', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1.5},
-            {'command': '\x04\n', 'validation_string': None, 'prompt_marker': constants.PROMPT_MARKERS['default']}
-        ],
-        "tg_stop":[
-            {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
-            {'command': '/usrptr/write_ofdma 0x15c4   0x0', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15c8   0x0', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15cc   0x1000000', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15d0   0xA077800', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x15d4   0x7f0', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal']},
-            {'command': '/usrptr/write_ofdma 0x181a44 0x40000', 'validation_string': 'Success', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1.5},
-            {'command': '\x04\n', 'validation_string': None, 'prompt_marker': constants.PROMPT_MARKERS['default']}
-        ],
-        # --- New and Renamed WBFFT Tasks ---
-        "get_wbfft": [],
-        "get_wbfft_hal_gains": [
-            {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
-            {'command': '/leap/fafe_show_status 4', 'wait_for_string': 'NcInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'delay_before_prompt': 0.5},
-            {'command': '/leap/lafe_show_status 0', 'wait_for_string': 'RxInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'delay_before_prompt': 0.5},
-            {'command': '/leap/lafe_show_status 4', 'wait_for_string': 'RxInputPower', 'prompt_marker': constants.PROMPT_MARKERS['hal'], 'delay_before_prompt': 0.5},
-            {'command': '\x04\n', 'validation_string': None, 'prompt_marker': constants.PROMPT_MARKERS['default']}
-        ],
-        "get_eq": [], 
-        "get_sf": [],
-        "adjust_north-afe-backoff": [], 
-        "get_ec": [],
-        "get_us_psd": [],
-        "adjust_us-fdx-settings": [],
-        "adjust_rlsp_diff": [],
-        "get_clipping": [],
-        "wait": [],
-    }
-    return sequences
+# atten-and-eq settings key -> (CLI command, validation string), in the order they are applied
+_RF_COMPONENT_SETTINGS = (
+    ("legacy-input-atten", "legacy-us-input-atten main", 'main legacy-us-input-atten is set from'),
+    ("ds-output-atten", "ds-output-atten", 'ds-output-attenuation-db is set from'),
+    ("ds-output-eq", "ds-output-eq", 'ds-output-eq-db is set from'),
+    ("us-fdx-atten", "us-fdx-atten", 'us-fdx-attenuation-db is set from'),
+    ("us-fdx-eq", "us-fdx-eq", 'us-fdx-equalization-db is set from'),
+)
+
+
+def _build_rf_components(settings, markers):
+    atteneq_settings = settings.get("atten-and-eq", {})
+
+    rf_components_sequence = [RF_COMPONENTS_STEP]
+    for settings_key, command, validation_string in _RF_COMPONENT_SETTINGS:
+        value = atteneq_settings.get(settings_key, "")
+        if value != "":
+            rf_components_sequence.append({'command': f"{command} {value}", 'validation_string': validation_string})
+
+    rf_components_sequence.append(EXIT_STEP)
+    return rf_components_sequence
+
+
+def _build_configure_ds_profile(settings, markers):
+    ds_settings = settings.get("ds-profile", {})
+    return [
+        DS_PROFILE_STEP,
+        {'command': f"start-freq {ds_settings.get('start-freq', '')}", 'validation_string': 'min-frequency-hertz" is set from'},
+        {'command': f"end-freq {ds_settings.get('end-freq', '')}", 'validation_string': 'max-frequency-hertz" is set from'},
+        {'command': f"start-power {round(float(ds_settings.get('start-power', 0)), 1)}", 'validation_string': '"ds-power-min-freq-dbmv" is set from'},
+        {'command': f"end-power {round(float(ds_settings.get('end-power', 0)), 1)}", 'validation_string': 'ds-power-max-freq-dbmv'},
+        COMMIT_LOCAL_STEP,
+        EXIT_STEP
+    ]
+
+
+def _build_configure_us_profile(settings, markers):
+    us_settings = settings.get("us-profile", {})
+    return [
+        US_PROFILE_STEP,
+        {'command': f"rlsp {us_settings.get('rlsp', '')}", 'validation_string': 'rlsp is set from'},
+        COMMIT_LOCAL_STEP,
+        EXIT_STEP
+    ]
+
+
+def _build_run_alignment(settings, markers):
+    alignment_timeout = settings.get("General settings", {}).get("alignment_timeout", 120)
+    return [
+        {'command': "configure alignment", 'validation_string': None, 'prompt_marker': markers['default']},
+        {'command': "start-ds1", 'validation_string': 'Completed DS1 alignment', 'prompt_marker': markers['default'], 'timeout': alignment_timeout},
+        {'command': 'start-ds2', 'validation_string': 'Completed DS2 alignment', 'prompt_marker': markers['default'], 'timeout': alignment_timeout},
+        {'command': 'start-ds3', 'validation_string': 'Completed DS3 alignment', 'prompt_marker': markers['default'], 'timeout': alignment_timeout},
+        {'command': 'start-us', 'validation_string': 'Completed US alignment', 'prompt_marker': markers['default'], 'timeout': alignment_timeout},
+        EXIT_STEP
+    ]
+
+
+def _build_upgradefw(settings, markers):
+    upgradefw_timeout = settings.get("General settings", {}).get("upgradefw_timeout", 600)
+    upgradefw_settings = settings.get("upgradefw", {})
+    return [ {'command': f"upgradefw http {upgradefw_settings.get('host', '')} {upgradefw_settings.get('filename', '')}", 'validation_string': "Successfully upgraded the image", 'timeout': upgradefw_timeout} ]
+
+
+def _build_configure_north_afe_backoff(settings, markers):
+    backoff_settings = settings.get("north-afe-backoff", {})
+    return [
+        NORTH_PORT_STEP,
+        {'command': f"north-afe-backoff {backoff_settings.get('backoff', '')}", 'validation_string': 'north-afe-backoff-db is set from'},
+        {'command': 'commit', 'validation_string': 'north-port param is saved in non-vol memory'},
+        EXIT_STEP
+    ]
+
+
+def _build_show_module_info(settings, markers):
+    return [{'command': 'showModuleInfo', 'parser': parsers.parse_module_info}]
+
+
+# Sub-modes whose show/commit sequences differ only in (enter step, parser, wait_for_string);
+# settings-independent, so they are built once at import.
+_SHOW_SPECS = (
+    ("show_spectrum", SPECTRUM_STEP, parsers.parse_spectrum_config, '-' * 41),
+    ("show_ds-profile", DS_PROFILE_STEP, parsers.parse_ds_profile_config, '-' * 42),
+    ("show_us-profile", US_PROFILE_STEP, parsers.parse_us_profile_config, '-' * 42),
+    ("show_north-afe-backoff", NORTH_PORT_STEP, parsers.parse_backoff_config, '-' * 41),
+)
+_SHOW_SEQUENCES = {
+    name: [enter_step, {'command': 'show configuration', 'parser': parser, 'wait_for_string': wait_for_string}, EXIT_STEP]
+    for name, enter_step, parser, wait_for_string in _SHOW_SPECS
+}
+_COMMIT_SEQUENCES = {
+    name: [enter_step, COMMIT_LOCAL_STEP, EXIT_STEP]
+    for name, enter_step in (("commit_ds-profile", DS_PROFILE_STEP), ("commit_us-profile", US_PROFILE_STEP))
+}
+
+
+def _prebuilt(sequence):
+    """Builder for a sequence that does not depend on the settings."""
+    return lambda settings, markers: sequence
+
+
+def _build_show_rf_components(settings, markers):
+    return [
+        RF_COMPONENTS_STEP,
+        {'command': 'show rf-components', 'parser': parsers.parse_rf_components_config, 'wait_for_string': 'pa-bias'},
+        EXIT_STEP
+    ]
+
+
+def _build_show_alignment(settings, markers):
+    return [
+        {'command': 'configure alignment', 'validation_string': None},
+        {'command': 'show alignment-status', 'parser': parsers.parse_alignment_status, 'wait_for_string': 'NET:'},
+        EXIT_STEP
+    ]
+
+
+def _build_show_fafe(settings, markers):
+    return [
+        {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': markers['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
+        {'command': '/leap/fafe_show_status 0', 'parser': parsers.parse_afe_status, 'wait_for_string': 'NcInputPower', 'prompt_marker': markers['hal'], 'clip_key': 'NcClipCount'},
+        {'command': '/leap/fafe_show_status 4', 'parser': parsers.parse_afe_status, 'wait_for_string': 'NcInputPower', 'prompt_marker': markers['hal'], 'clip_key': 'NcClipCount'},
+        {'command': '/leap/lafe_show_status 0', 'parser': parsers.parse_afe_status, 'wait_for_string': 'RxInputPower', 'prompt_marker': markers['hal'], 'clip_key': 'RxClipCount'},
+        {'command': '/leap/lafe_show_status 4', 'parser': parsers.parse_afe_status, 'wait_for_string': 'RxInputPower', 'prompt_marker': markers['hal'], 'clip_key': 'RxClipCount'},
+        {'command': '/leap/lafe_show_status 5', 'parser': parsers.parse_afe_status, 'wait_for_string': 'RxInputPower', 'prompt_marker': markers['hal'], 'clip_key': 'RxClipCount'},
+        {'command': '\x04\n', 'validation_string': None, 'prompt_marker': markers['default']}
+    ]
+
+
+def _build_get_nc_input_power(settings, markers):
+    return [
+        {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': markers['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
+        {'command': '/leap/fafe_show_status 4', 'parser': parsers.parse_afe_status, 'wait_for_string': 'NcInputPower', 'prompt_marker': markers['hal']},
+        {'command': '\x04\n', 'validation_string': None, 'prompt_marker': markers['default']}
+    ]
+
+
+def _build_reset(settings, markers):
+    return [ {'command': "reset", 'validation_string': "reset"} ]
+
+
+def _build_generate_key(settings, markers):
+    return [ {'command': "configure crypto key generate rsa", 'validation_string': "SSH host rsa private key has beensuccessfully imported."} ]
+
+
+def _build_tg_start(settings, markers):
+    return [
+        {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': markers['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
+        {'command': '/usrptr/write_ofdma 0x15c4   0x0', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15c8   0x0', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15cc   0x1000000', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15d0   0x9077800', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15d4   0x7f0', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x181a44 0x40000', 'validation_string': 'Success', 'prompt_marker': markers['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1.5},
+        {'command': '\x04\n', 'validation_string': None, 'prompt_marker': markers['default']}
+    ]
+
+
+def _build_tg_stop(settings, markers):
+    return [
+        {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': markers['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
+        {'command': '/usrptr/write_ofdma 0x15c4   0x0', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15c8   0x0', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15cc   0x1000000', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15d0   0xA077800', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x15d4   0x7f0', 'validation_string': 'Success', 'prompt_marker': markers['hal']},
+        {'command': '/usrptr/write_ofdma 0x181a44 0x40000', 'validation_string': 'Success', 'prompt_marker': markers['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1.5},
+        {'command': '\x04\n', 'validation_string': None, 'prompt_marker': markers['default']}
+    ]
+
+
+def _build_get_wbfft_hal_gains(settings, markers):
+    return [
+        {'command': 'debug hal\r\nlog_config --off', 'validation_string': 'Connected', 'prompt_marker': markers['hal'], 'wait_for_prompt': False, 'delay_before_prompt': 1},
+        {'command': '/leap/fafe_show_status 4', 'wait_for_string': 'NcInputPower', 'prompt_marker': markers['hal'], 'delay_before_prompt': 0.5},
+        {'command': '/leap/lafe_show_status 0', 'wait_for_string': 'RxInputPower', 'prompt_marker': markers['hal'], 'delay_before_prompt': 0.5},
+        {'command': '/leap/lafe_show_status 4', 'wait_for_string': 'RxInputPower', 'prompt_marker': markers['hal'], 'delay_before_prompt': 0.5},
+        {'command': '\x04\n', 'validation_string': None, 'prompt_marker': markers['default']}
+    ]
+
+
+def _build_empty(settings, markers):
+    """Tasks implemented directly in ssh_manager carry no command sequence of their own."""
+    return []
+
+
+# Task name -> builder(settings, prompt_markers)
+_SEQUENCE_BUILDERS = {
+    "showModuleInfo": _build_show_module_info,
+    "show_spectrum": _prebuilt(_SHOW_SEQUENCES["show_spectrum"]),
+    "show_ds-profile": _prebuilt(_SHOW_SEQUENCES["show_ds-profile"]),
+    "show_us-profile": _prebuilt(_SHOW_SEQUENCES["show_us-profile"]),
+    "show_north-afe-backoff": _prebuilt(_SHOW_SEQUENCES["show_north-afe-backoff"]),
+    "show_rf_components": _build_show_rf_components,
+    "show_alignment": _build_show_alignment,
+    "show_fafe": _build_show_fafe,
+    "get_nc_input_power": _build_get_nc_input_power,
+    "configure_spectrum": _build_spectrum,
+    "configure_ds-profile": _build_configure_ds_profile,
+    "commit_ds-profile": _prebuilt(_COMMIT_SEQUENCES["commit_ds-profile"]),
+    "configure_us-profile": _build_configure_us_profile,
+    "commit_us-profile": _prebuilt(_COMMIT_SEQUENCES["commit_us-profile"]),
+    "run_alignment": _build_run_alignment,
+    "reset": _build_reset,
+    "upgradefw": _build_upgradefw,
+    "generate_key": _build_generate_key,
+    "configure_north-afe-backoff": _build_configure_north_afe_backoff,
+    "configure_rf_components": _build_rf_components,
+    "tg_start": _build_tg_start,
+    "tg_stop": _build_tg_stop,
+    # --- New and Renamed WBFFT Tasks ---
+    "get_wbfft": _build_empty,
+    "get_wbfft_hal_gains": _build_get_wbfft_hal_gains,
+    "get_eq": _build_empty,
+    "get_sf": _build_empty,
+    "adjust_north-afe-backoff": _build_empty,
+    "get_ec": _build_empty,
+    "get_us_psd": _build_empty,
+    "adjust_us-fdx-settings": _build_empty,
+    "adjust_rlsp_diff": _build_empty,
+    "get_clipping": _build_empty,
+    "wait": _build_empty,
+}
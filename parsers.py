@@ -1,22 +1,46 @@
 import re
+import io
+import functools
+import warnings
 import pandas as pd
 import logging
 import numpy as np
 
+# Patterns used by the parsers, compiled once at import
+_SUBBAND_RE = re.compile(r'subBand Mode:(\d+)\s+"([^"]+)"')
+# First two columns of a stripped 'key  value  ...' row (columns are separated by 2+ spaces)
+_KV_COLUMNS_RE = re.compile(r'(\S+(?:\s\S+)*)\s{2,}(\S+(?:\s\S+)*)')
+_NUMERIC_RE = re.compile(r'([\d\.]+)')
+_STEP_RE = re.compile(r'step-index:(\d+)\s+([\w-]+)\s+([\d\.]+)')
+_VALUE_RE = re.compile(r'([\d\.]+|\w+)')
+_RLSP_RE = re.compile(r"rlsp\s+([\d\.]+)")
+_STATUS_RE = re.compile(r"Status:\s+(\w+)")
+_BACKOFF_RE = re.compile(r"backoff\s+([\d\.]+)")
+# 'key [port] value' rows of 'show rf-components'; the port group is None for single-port keys
+_RF_COMBINED_RE = re.compile(r'^([\w-]+)\s+(?:(\w+)\s+)?([\d\.]+)')
+_EQ_PAT = re.compile(r'slope by\s*\"(-?[\d\.]+)\"')
+_ATTEN_PAT = re.compile(r'\(PAD IN\).*?by\s*\"(-?[\d\.]+)\"')
+_AFE_HEADER_RE = re.compile(r'((?:FAFE|LAFE)\s(?:core|status: Core)\s?-?(\d+))', re.IGNORECASE)
+_AFE_KV_RE = re.compile(r'^\s*([\w\s]+?)\s*=\s*(.*)', re.MULTILINE)
+_GAIN_PAT = re.compile(r'\(([^d]+)dB\)')
+# Touchstone option line ('# Hz S MA R 50'); data rows follow it
+_S2P_OPTION_LINE_RE = re.compile(r'^[^\S\n]*#.*$', re.MULTILINE)
+
 def parse_key_value_output(output_text, command_name):
     """Generic parser for commands that return 'Key: Value' pairs."""
     parsed_data = {}
     if not output_text:
         return parsed_data
+    command_key = command_name.lower()
     for line in output_text.splitlines():
-        if ':' in line:
-            parts = line.split(':', 1)
-            key = parts[0].strip()
-            value = parts[1].strip()
-            value_parts = value.split()
-            final_value = value_parts[0] if value_parts else ""
-            if key and final_value and key.lower() != command_name.lower():
-                parsed_data[key] = final_value
+        key, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key = key.strip()
+        # Only the first whitespace-delimited token of the value is kept
+        value_parts = value.split(None, 1)
+        if key and value_parts and key.lower() != command_key:
+            parsed_data[key] = value_parts[0]
     return parsed_data
 
 def parse_module_info(output_text):
@@ -26,20 +50,19 @@ def parse_module_info(output_text):
 def parse_spectrum_config(output):
     """Parses all values from 'show configuration' in spectrum mode."""
     config = {}
-    lines = output.splitlines()
-    for line in lines:
+    for line in output.splitlines():
         line = line.strip()
-        subband_match = re.match(r'subBand Mode:(\d+)\s+"([^"]+)"', line)
+        subband_match = _SUBBAND_RE.match(line)
         if subband_match:
             subband_index = subband_match.group(1)
             mode = subband_match.group(2)
             config[f'subband_{subband_index}_mode'] = mode
             continue
-        parts = re.split(r'\s{2,}', line)
-        if len(parts) >= 2:
-            key = parts[0].strip().replace(' ', '_')
-            value_part = parts[1].strip()
-            numeric_value_match = re.match(r'([\d\.]+)', value_part)
+        columns_match = _KV_COLUMNS_RE.match(line)
+        if columns_match:
+            key, value_part = columns_match.groups()
+            key = key.replace(' ', '_')
+            numeric_value_match = _NUMERIC_RE.match(value_part)
             if numeric_value_match:
                 value = numeric_value_match.group(1)
             else:
@@ -54,7 +77,7 @@ def parse_ds_profile_config(output):
     steps = {}
     for line in output.splitlines():
         line = line.strip()
-        step_match = re.match(r'step-index:(\d+)\s+([\w-]+)\s+([\d\.]+)', line)
+        step_match = _STEP_RE.match(line)
         if step_match:
             index_str, key, value = step_match.groups()
             index = int(index_str)
@@ -63,11 +86,10 @@ def parse_ds_profile_config(output):
                 steps[index] = {'index': index}
             steps[index][key] = value
             continue
-        parts = re.split(r'\s{2,}', line)
-        if len(parts) >= 2:
-            key = parts[0].strip()
-            value_part = parts[1].strip()
-            value_match = re.match(r'([\d\.]+|\w+)', value_part)
+        columns_match = _KV_COLUMNS_RE.match(line)
+        if columns_match:
+            key, value_part = columns_match.groups()
+            value_match = _VALUE_RE.match(value_part)
             if value_match:
                 value = value_match.group(1)
             else:
@@ -81,7 +103,7 @@ def parse_ds_profile_config(output):
 def parse_us_profile_config(output):
     """Parses the output of 'show configuration' in us-profile mode."""
     config = {}
-    match = re.search(r"rlsp\s+([\d\.]+)", output)
+    match = _RLSP_RE.search(output)
     if match:
         config['rlsp'] = match.group(1).strip()
     return config
@@ -89,7 +111,7 @@ def parse_us_profile_config(output):
 def parse_ds_freq_override_config(output):
     """Parses 'show configuration' in the ds-freq-override sub-mode."""
     config = {}
-    match = re.search(r"Status:\s+(\w+)", output)
+    match = _STATUS_RE.search(output)
     if match:
         config['status'] = match.group(1).strip()
     return config
@@ -97,7 +119,7 @@ def parse_ds_freq_override_config(output):
 def parse_backoff_config(output):
     """Parses the output of 'show configuration' in north-port mode."""
     config = {}
-    match = re.search(r"backoff\s+([\d\.]+)", output)
+    match = _BACKOFF_RE.search(output)
     if match:
         config['backoff'] = match.group(1).strip()
     return config
@@ -105,29 +127,25 @@ def parse_backoff_config(output):
 def parse_rf_components_config(output):
     """Parses the output of 'show rf-components'."""
     config = {}
-    lines = output.splitlines()
-    for line in lines:
-        match_port = re.match(r'^([\w-]+)\s+(\w+)\s+([\d\.]+)', line.strip())
-        match_no_port = re.match(r'^([\w-]+)\s+([\d\.]+)', line.strip())
-        if match_port:
-            key, port, value = match_port.groups()
-            config_key = f"{key.strip()} {port.strip()}"
-            config[config_key] = value.strip()
-        elif match_no_port:
-            key, value = match_no_port.groups()
-            config[key.strip()] = value.strip()
+    for line in output.splitlines():
+        match = _RF_COMBINED_RE.match(line.strip())
+        if not match:
+            continue
+        key, port, value = match.groups()
+        config[f"{key} {port}" if port is not None else key] = value
     return config
 
 def parse_alignment_status(output):
     """Parses the output of 'show alignment-status'."""
     config = {}
     for line in output.splitlines():
-        if ':' in line:
-            parts = line.split(':', 1)
-            key = parts[0].strip()
-            value = parts[1].strip()
-            if key and value:
-                config[key] = value
+        key, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key = key.strip()
+        value = value.strip()
+        if key and value:
+            config[key] = value
     return config
 
 def parse_alignment_adjustment(output_text, adjustment_type):
@@ -137,9 +155,9 @@ def parse_alignment_adjustment(output_text, adjustment_type):
     
     pattern = None
     if adjustment_type == 'eq':
-        pattern = re.compile(r'slope by\s*\"(-?[\d\.]+)\"')
+        pattern = _EQ_PAT
     elif adjustment_type == 'atten':
-        pattern = re.compile(r'\(PAD IN\).*?by\s*\"(-?[\d\.]+)\"')
+        pattern = _ATTEN_PAT
 
     if pattern:
         match = pattern.search(output_text)
@@ -151,37 +169,71 @@ def parse_alignment_adjustment(output_text, adjustment_type):
                 return None
     return None
 
+@functools.lru_cache(maxsize=64)
+def _afe_top_key(header):
+    """Normalizes an AFE header such as 'LAFE status: Core -2' to 'LAFE_Core__2'; only a few distinct headers exist."""
+    top_key_raw = header.replace('status:','').replace('  ', ' ')
+    return "_".join(top_key_raw.split()).replace('-', '_')
+
 def parse_afe_status(output):
     """Parses the output of fafe_show_status and lafe_show_status commands."""
     data = {}
-    header_match = re.search(r'((?:FAFE|LAFE)\s(?:core|status: Core)\s?-?(\d+))', output, re.IGNORECASE)
+    header_match = _AFE_HEADER_RE.search(output)
     if not header_match:
         return {} 
-    top_key_raw = header_match.group(1).replace('status:','').replace('  ', ' ')
-    top_key = "_".join(top_key_raw.split()).replace('-', '_')
-    data[top_key] = {}
-    kv_matches = re.findall(r'^\s*([\w\s]+?)\s*=\s*(.*)', output, re.MULTILINE)
-    current_data = data[top_key]
-    for key, value in kv_matches:
-        key = key.strip()
-        value = value.strip()
-        current_data[key] = value
+    top_key = _afe_top_key(header_match.group(1))
+    current_data = {}
+    for kv_match in _AFE_KV_RE.finditer(output):
+        key, value = kv_match.groups()
+        current_data[key.strip()] = value.strip()
     if top_key.startswith("FAFE"):
-        rx_data = {k: v for k, v in current_data.items() if k.startswith('Rx')}
-        nc_data = {k: v for k, v in current_data.items() if k.startswith('Nc')}
-        if rx_data or nc_data:
-            if rx_data:
-                for k in list(current_data.keys()):
-                    if k.startswith('Rx'):
-                        del current_data[k]
-                current_data['Rx'] = rx_data
-            if nc_data:
-                for k in list(current_data.keys()):
-                    if k.startswith('Nc'):
-                        del current_data[k]
-                current_data['Nc'] = nc_data
+        # Group the Rx* and Nc* keys into 'Rx' / 'Nc' sub-dicts placed after the remaining keys
+        rx_data, nc_data, rest = {}, {}, {}
+        for k, v in current_data.items():
+            (rx_data if k.startswith('Rx') else nc_data if k.startswith('Nc') else rest)[k] = v
+        if rx_data:
+            rest['Rx'] = rx_data
+        if nc_data:
+            rest['Nc'] = nc_data
+        current_data = rest
+    data[top_key] = current_data
     return data
 
+def _load_numeric_columns(text, delimiter=None, usecols=None, comments=None):
+    """
+    Parses delimited numeric text with numpy's C reader.
+    Returns a 2-D float array, or None if the text is empty or any line does not parse cleanly,
+    in which case the caller falls back to its line-by-line parser.
+    """
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # "input contained no data"
+            data = np.loadtxt(io.StringIO(text), delimiter=delimiter, usecols=usecols, comments=comments, ndmin=2, dtype=np.float64)
+    except ValueError:
+        return None
+    return data if data.size else None
+
+def _load_s21_columns(text, file_format):
+    """Fast path for parse_s2p_data: returns (frequencies, magnitudes) arrays, or None to use the per-line parser."""
+    if file_format == 's2p':
+        option_line = _S2P_OPTION_LINE_RE.search(text)
+        if not option_line:
+            return None
+        data = _load_numeric_columns(text[option_line.end():], usecols=(0, 3), comments=('!', '#'))
+    elif file_format == 'fsw_txt':
+        values_pos = text.find('Values;')
+        if values_pos < 0:
+            return None
+        data = _load_numeric_columns(text[values_pos:].partition('\n')[2], delimiter=';', usecols=(0, 1))
+    else:
+        # wbfft_txt: rows are 'freq:value' after the 'Received N bins' header line
+        data = _load_numeric_columns(text.partition('\n')[2], delimiter=':')
+        if data is not None and data.shape[1] != 2:
+            return None
+    if data is None:
+        return None
+    return data[:, 0], data[:, 1]
+
 def parse_s2p_data(filepath):
     """
     Parses S21 data from multiple file formats (Touchstone .s2p, FSW .txt, WBFFT .txt).
@@ -199,7 +251,11 @@ def parse_s2p_data(filepath):
             else:
                 file_format = 's2p'
             f.seek(0)
-            if file_format == 's2p':
+            columns = _load_s21_columns(f.read(), file_format)
+            f.seek(0)
+            if columns is not None:
+                frequencies, s21_magnitudes = columns
+            elif file_format == 's2p':
                 data_started = False
                 for line in f:
                     line = line.strip()
@@ -225,7 +281,7 @@ def parse_s2p_data(filepath):
                         try:
                             frequencies.append(float(parts[0])); s21_magnitudes.append(float(parts[1]))
                         except ValueError: continue
-        if not frequencies: return None
+        if len(frequencies) == 0: return None
         return pd.DataFrame({'Frequency': frequencies, 'S21_Magnitude': s21_magnitudes})
     except FileNotFoundError:
         logging.error(f"S-parameter/calibration file not found: {filepath}")
@@ -239,12 +295,19 @@ def parse_wbfft_data(filepath):
     data = []
     try:
         with open(filepath, 'r') as f:
-            for line in f:
-                if ":" in line and (parts := line.strip().split(':')) and len(parts) == 2:
-                    try:
-                        data.append({'Frequency': float(parts[0]), 'Amplitude': float(parts[1])})
-                    except ValueError:
-                        continue
+            text = f.read()
+        # A leading 'Received N bins' line is not a data row
+        header, _, rest = text.partition('\n')
+        columns = _load_numeric_columns(rest if 'Received' in header else text, delimiter=':')
+        if columns is not None and columns.shape[1] == 2:
+            return pd.DataFrame({'Frequency': columns[:, 0], 'Amplitude': columns[:, 1]})
+        # Some line is not a clean 'freq:value' row; parse line by line, skipping those
+        for line in text.split('\n'):
+            if ":" in line and (parts := line.strip().split(':')) and len(parts) == 2:
+                try:
+                    data.append({'Frequency': float(parts[0]), 'Amplitude': float(parts[1])})
+                except ValueError:
+                    continue
         if not data:
             logging.error(f"No valid data in WBFFT file: {filepath}")
             return None
@@ -259,19 +322,25 @@ def parse_wbfft_data(filepath):
 def parse_hal_gains_from_output(raw_output, section_marker, gain_names):
     """Generic function to parse gain values from a HAL status raw output string."""
     gains = {name: None for name in gain_names}
+    remaining = list(gain_names)
     in_target_section = False
-    gain_pattern = re.compile(r'\(([^d]+)dB\)')
     try:
         for line in raw_output.splitlines():
             if section_marker in line:
                 in_target_section = True
                 continue
             if in_target_section:
-                for name in gain_names:
-                    if name in line:
-                        match = gain_pattern.search(line)
-                        if match:
-                            gains[name] = float(match.group(1))
+                found = [name for name in remaining if name in line]
+                if found:
+                    match = _GAIN_PAT.search(line)
+                    if match:
+                        value = float(match.group(1))
+                        for name in found:
+                            gains[name] = value
+                        remaining = [name for name in remaining if name not in found]
+                        # Stop reading once every gain has been found
+                        if not remaining:
+                            return gains
                 # Heuristic to find the end of the section
                 if "lafe_show_status" in line or "fafe_show_status" in line:
                     if section_marker not in line:
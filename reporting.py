@@ -1,4 +1,5 @@
 import webbrowser
+import concurrent.futures
 import plotly.graph_objects as go
 import plotly.io as pio
 from plotly.subplots import make_subplots
@@ -15,26 +16,118 @@ import matplotlib
 from matplotlib import font_manager
 import mpld3
 
-# Setup custom font for matplotlib (if needed)
-font_dirs = ["resources/fonts"]  # The path to the custom font file.
-font_files = font_manager.findSystemFonts(fontpaths=font_dirs)
-
-for font_file in font_files:
-    font_manager.fontManager.addfont(font_file)
-
-plt.rcParams['font.family'] = 'ComcastNewVision'  # Use the custom font for all plots
-
-def generate_eq_html_report(mac_address, us_coeffs, ds_coeffs, output_filename, freq_resolution_mhz):
+# Custom matplotlib font, registered on first use by the matplotlib reports rather than at import
+_FONT_REGISTERED = False
+
+def _ensure_font():
+    """Registers the custom font for matplotlib once per process."""
+    global _FONT_REGISTERED
+    if _FONT_REGISTERED:
+        return
+    font_dirs = ["resources/fonts"]  # The path to the custom font file.
+    font_files = font_manager.findSystemFonts(fontpaths=font_dirs)
+
+    for font_file in font_files:
+        font_manager.fontManager.addfont(font_file)
+
+    plt.rcParams['font.family'] = 'ComcastNewVision'  # Use the custom font for all plots
+    _FONT_REGISTERED = True
+
+# Options for every pio.write_html call: reports share one plotly.min.js written next to them (kept
+# offline-viewable, unlike a CDN link) instead of each embedding ~3MB of it, and the figures are
+# built by this module so the per-property validation pass is skipped.
+_WRITE_HTML_KWARGS = {'include_plotlyjs': 'directory', 'validate': False}
+
+# Report file name timestamps. The report functions accept a precomputed `timestamp` so a run that
+# writes several reports can format the time once and give them all the same suffix.
+REPORT_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+# Opening a tab can block for seconds while the browser starts, so reports hand it to this pool
+_BROWSER_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix='report-browser')
+
+def _open_in_browser(filename):
+    """Opens a report file in a new browser tab without blocking the caller."""
+    _BROWSER_POOL.submit(webbrowser.open_new_tab, f"file://{os.path.abspath(filename)}")
+
+def _save_html_report(fig, filename, open_browser):
+    """Writes a Plotly figure to filename and, if requested, opens it in the browser."""
+    pio.write_html(fig, filename, **_WRITE_HTML_KWARGS)
+    if open_browser:
+        _open_in_browser(filename)
+
+def _to_db(coeffs):
+    """Returns 20*log10(|coeffs|), with -inf for zero taps; |coeffs| is computed once and the result buffer reused."""
+    magnitude = np.abs(np.asarray(coeffs))
+    nonzero = magnitude > 0
+    amp_db = np.full(magnitude.shape, -np.inf)
+    np.log10(magnitude, where=nonzero, out=amp_db)
+    np.multiply(amp_db, 20.0, where=nonzero, out=amp_db)
+    return amp_db
+
+def _downsample(x, y, n_target=4000):
+    """Reduces a trace to n_target points with Largest-Triangle-Three-Buckets, keeping the peaks and valleys.
+
+    Screen-resolution plots gain nothing from 100k+ points beyond a bloated HTML file, so traces longer
+    than 1.5*n_target are cut down; shorter ones are returned unchanged. The first and last points are
+    always kept and every bucket in between contributes the point forming the largest triangle with the
+    previously kept point and the mean of the next bucket. Non-finite points (NaN gaps or columns missing
+    from an outer merge, -inf from log10(0)) are skipped; a bucket holding nothing else keeps one of them.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_target < 3 or n <= 1.5 * n_target:
+        return x, y
+    finite = np.isfinite(y)
+    if not finite.any():
+        keep = np.linspace(0, n - 1, n_target).astype(np.intp)
+        return x[keep], y[keep]
+    edges = np.linspace(1, n - 1, n_target - 1).astype(np.intp)
+    starts, ends = edges[:-1], edges[1:]
+    # Means over each bucket's finite points in one pass; the last finite point stands in for the bucket
+    # after the final one, and a bucket without finite points borrows the mean of the next one that has some
+    counts = np.add.reduceat(finite[1:n - 1].astype(np.intp), starts - 1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_x = np.add.reduceat(np.where(finite, x, 0.0)[1:n - 1], starts - 1) / counts
+        mean_y = np.add.reduceat(np.where(finite, y, 0.0)[1:n - 1], starts - 1) / counts
+    last = n - 1 - int(np.argmax(finite[::-1]))
+    mean_x = np.append(mean_x, x[last])
+    mean_y = np.append(mean_y, y[last])
+    valid = np.append(counts > 0, True)
+    next_valid = np.minimum.accumulate(np.where(valid, np.arange(len(valid)), len(valid) - 1)[::-1])[::-1]
+    mean_x, mean_y = mean_x[next_valid], mean_y[next_valid]
+    keep = np.empty(n_target, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    prev = int(np.argmax(finite))
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        if not counts[i]:
+            keep[i + 1] = start
+            continue
+        bx, by = x[start:end], y[start:end]
+        # Twice the triangle area; the constant factor doesn't change the argmax. Non-finite points are
+        # ranked below every finite one so prev always stays on a finite point.
+        area = np.abs((x[prev] - mean_x[i + 1]) * (by - y[prev]) - (x[prev] - bx) * (mean_y[i + 1] - y[prev]))
+        area = np.where(finite[start:end], area, -1.0)
+        prev = start + int(np.argmax(area))
+        keep[i + 1] = prev
+    return x[keep], y[keep]
+
+def _concat_subbands(subband_data, key):
+    """Concatenates subband_data[i][key] across subbands into one float array in a single allocation."""
+    arrays = [np.asarray(data.get(key, []), dtype=float) for data in subband_data]
+    return np.concatenate(arrays) if arrays else np.empty(0)
+
+def generate_eq_html_report(mac_address, us_coeffs, ds_coeffs, output_filename, freq_resolution_mhz, open_browser=True):
     """Generates an interactive HTML plot using Plotly for the decoded coefficients."""
     fig = go.Figure()
     if us_coeffs:
         us_freq = np.arange(len(us_coeffs)) * freq_resolution_mhz
-        us_amp_db = 20 * np.log10(np.abs(us_coeffs), where=(np.abs(us_coeffs) > 0), out=np.full(len(us_coeffs), -np.inf))
-        fig.add_trace(go.Scatter(x=us_freq, y=us_amp_db, mode='lines', name='Upstream Pre-Equalizer'))
+        us_amp_db = _to_db(us_coeffs)
+        fig.add_trace(go.Scattergl(x=us_freq, y=us_amp_db, mode='lines', name='Upstream Pre-Equalizer'))
     if ds_coeffs:
         ds_freq = np.arange(len(ds_coeffs)) * freq_resolution_mhz
-        ds_amp_db = 20 * np.log10(np.abs(ds_coeffs), where=(np.abs(ds_coeffs) > 0), out=np.full(len(ds_coeffs), -np.inf))
-        fig.add_trace(go.Scatter(x=ds_freq, y=ds_amp_db, mode='lines', name='Downstream Line Equalizer'))
+        ds_amp_db = _to_db(ds_coeffs)
+        fig.add_trace(go.Scattergl(x=ds_freq, y=ds_amp_db, mode='lines', name='Downstream Line Equalizer'))
     fig.update_layout(
         title=f'Equalizer Frequency Response for {mac_address}',
         xaxis_title='Frequency (MHz)',
@@ -43,17 +136,12 @@ def generate_eq_html_report(mac_address, us_coeffs, ds_coeffs, output_filename,
         height=900
     )
     try:
-        pio.write_html(fig, output_filename)
-        #open html
-        abs_path = os.path.abspath(output_filename)
-        # print(f"{abs_path}")
-        url = f"file://{abs_path}"
-        webbrowser.open_new_tab(url)        
+        _save_html_report(fig, output_filename, open_browser)
         logging.info(f"[{mac_address}] Interactive HTML plot saved to {output_filename}")
     except Exception as e:
         logging.error(f"[{mac_address}] Failed to save interactive HTML plot: {e}")
 
-def generate_sf_html_report(mac_address, taps_data, freq_data, output_dir):
+def generate_sf_html_report(mac_address, taps_data, freq_data, output_dir, timestamp=None, open_browser=True):
     """Generates an interactive HTML plot for the shaping filter analysis."""
     fig = make_subplots(
         rows=2, cols=1, 
@@ -61,20 +149,30 @@ def generate_sf_html_report(mac_address, taps_data, freq_data, output_dir):
     )
 
     tap_numbers = list(range(len(taps_data)))
+
+    # Stems from 0 to each tap as one trace: (i, 0) -> (i, val) segments separated by NaN gaps
+    num_taps = len(taps_data)
+    stem_x = np.empty(3 * num_taps)
+    stem_y = np.empty(3 * num_taps)
+    stem_x[0::3] = stem_x[1::3] = np.arange(num_taps)
+    stem_y[0::3] = 0
+    stem_y[1::3] = taps_data
+    stem_x[2::3] = stem_y[2::3] = np.nan
+    fig.add_trace(go.Scatter(
+        x=stem_x,
+        y=stem_y,
+        mode='lines',
+        line=dict(color="grey", width=1),
+        hoverinfo='skip',
+        showlegend=False
+    ), row=1, col=1)
+
     fig.add_trace(go.Scatter(
         x=tap_numbers,
         y=taps_data,
         mode='markers',
         name='Taps'
     ), row=1, col=1)
-    
-    for i, val in enumerate(taps_data):
-        fig.add_shape(
-            type="line",
-            x0=i, y0=0, x1=i, y1=val,
-            line=dict(color="grey", width=1),
-            row=1, col=1
-        )
 
     freq_axis_mhz, magnitude_db = freq_data
     fig.add_trace(go.Scatter(
@@ -98,26 +196,21 @@ def generate_sf_html_report(mac_address, taps_data, freq_data, output_dir):
     fig.update_yaxes(title_text="Normalized Magnitude (dB)", row=2, col=1)
 
     sanitized_mac = mac_address.replace(':', '')
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = timestamp or datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)
     output_filename = os.path.join(output_dir, f"{sanitized_mac}_get_sf_data_{timestamp}.html")
 
     try:
-        pio.write_html(fig, output_filename)
-        abs_path = os.path.abspath(output_filename)
-        logging.info(f"Opening interactive WBFFT report in web browser: {abs_path}")
-        # print(f"{abs_path}")
-        url = f"file://{abs_path}"
-        webbrowser.open_new_tab(url)
+        _save_html_report(fig, output_filename, open_browser)
         logging.info(f"[{mac_address}] Interactive SF report saved to {output_filename}")
         return output_filename
     except Exception as e:
         logging.error(f"[{mac_address}] Failed to save interactive SF report: {e}")
         return None
 
-def generate_ec_html_report(mac_address, decoded_data, output_dir):
+def generate_ec_html_report(mac_address, decoded_data, output_dir, timestamp=None, open_browser=True):
     """Generates interactive HTML plots for the decoded EC data."""
     sanitized_mac = mac_address.replace(':', '')
-    timestamp = datetime.now().strftime('%Ym%d_%H%M%S')
+    timestamp = timestamp or datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)
     
     fig_coef = make_subplots(rows=2, cols=1, subplot_titles=("Time Coef (IFFT)", "Freq Coef"))
     
@@ -126,11 +219,9 @@ def generate_ec_html_report(mac_address, decoded_data, output_dir):
             fig_coef.add_trace(go.Scatter(x=data.get('distance_ft', []), y=data.get('values_db', []), mode='lines', name=f"Time Coef sb{subBandId}"), row=1, col=1)
     
     if 1 in decoded_data:
-        full_freq_x, full_freq_y = [], []
-        for subBandId, data in decoded_data[1].items():
-            full_freq_x.extend(data.get('frequencies_mhz', []))
-            full_freq_y.extend(data.get('values', []))
-        fig_coef.add_trace(go.Scatter(x=full_freq_x, y=full_freq_y, mode='lines', name="Freq Coef"), row=2, col=1)
+        full_freq_x = _concat_subbands(decoded_data[1].values(), 'frequencies_mhz')
+        full_freq_y = _concat_subbands(decoded_data[1].values(), 'values')
+        fig_coef.add_trace(go.Scattergl(x=full_freq_x, y=full_freq_y, mode='lines', name="Freq Coef"), row=2, col=1)
         
     fig_coef.update_layout(title=f'Echo Cancellation Coefficients for {mac_address}', template='plotly_white', height=900)
     fig_coef.update_xaxes(title_text="Distance (ft)", row=1, col=1)
@@ -144,36 +235,24 @@ def generate_ec_html_report(mac_address, decoded_data, output_dir):
         psd_filename = f"{base_no_ext}_psd.html"
     else:
         coef_filename = os.path.join(output_dir, f"{sanitized_mac}_get_ec_coefs_data_{timestamp}.html")
-    pio.write_html(fig_coef, coef_filename)
-    #open html
-    abs_path = os.path.abspath(coef_filename)
-    # print(f"{abs_path}")
-    url = f"file://{abs_path}"
-    webbrowser.open_new_tab(url)
+    _save_html_report(fig_coef, coef_filename, open_browser)
     logging.info(f"[{mac_address}] Saved EC Coefficient HTML report to {coef_filename}")
 
     fig_psd = go.Figure()
     psd_types = {5: "Echo PSD", 6: "Residual Echo PSD", 7: "Downstream PSD", 8: "Upstream PSD"}
     for statsType, name in psd_types.items():
         if statsType in decoded_data:
-            full_x, full_y = [], []
-            for subBandId, data in decoded_data[statsType].items():
-                full_x.extend(data.get('frequencies_mhz', []))
-                full_y.extend(data.get('values', []))
-            fig_psd.add_trace(go.Scatter(x=full_x, y=full_y, mode='lines', name=name))
+            full_x = _concat_subbands(decoded_data[statsType].values(), 'frequencies_mhz')
+            full_y = _concat_subbands(decoded_data[statsType].values(), 'values')
+            fig_psd.add_trace(go.Scattergl(x=full_x, y=full_y, mode='lines', name=name))
     fig_psd.update_layout(title=f'EC PSD Metrics for {mac_address}', xaxis_title='Frequency (MHz)', yaxis_title='Power (dBmV/100kHz)', template='plotly_white', height=900)
     # If psd_filename wasn't set above (output_dir was directory), build it now.
     if 'psd_filename' not in locals():
         psd_filename = os.path.join(output_dir, f"{sanitized_mac}_get_ec_psd_data_{timestamp}.html")
-    pio.write_html(fig_psd, psd_filename)
-    #open html
-    abs_path = os.path.abspath(psd_filename)
-    # print(f"{abs_path}")
-    url = f"file://{abs_path}"
-    webbrowser.open_new_tab(url)    
+    _save_html_report(fig_psd, psd_filename, open_browser)
     logging.info(f"[{mac_address}] Saved EC PSD Metrics HTML report to {psd_filename}")
 
-def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir):
+def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir, timestamp=None, open_browser=True):
     """Generates HTML reports for EC data using matplotlib (prefer mpld3 for interactivity).
 
     If `mpld3` is installed the function writes fully interactive HTML (zoom, pan, tooltips).
@@ -185,9 +264,10 @@ def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir):
         matplotlib.use('Agg')
     except Exception:
         pass
+    _ensure_font()
 
     sanitized_mac = mac_address.replace(':', '')
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = timestamp or datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)
 
     # --- Coefficients figure ---
     fig1, axes = plt.subplots(2, 1, figsize=(10, 8))
@@ -206,11 +286,9 @@ def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir):
 
     # Freq Coef
     if 1 in decoded_data:
-        full_freq_x, full_freq_y = [], []
-        for subBandId, data in decoded_data[1].items():
-            full_freq_x.extend(data.get('frequencies_mhz', []))
-            full_freq_y.extend(data.get('values', []))
-        if full_freq_x and full_freq_y:
+        full_freq_x = _concat_subbands(decoded_data[1].values(), 'frequencies_mhz')
+        full_freq_y = _concat_subbands(decoded_data[1].values(), 'values')
+        if full_freq_x.size and full_freq_y.size:
             axes[1].plot(full_freq_x, full_freq_y, '-k')
     axes[1].set_title(f'Freq Coef for {mac_address}')
     axes[1].set_xlabel('Frequency (MHz)')
@@ -229,8 +307,8 @@ def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir):
             # Fallback: embed PNG as base64
             buf1 = io.BytesIO()
             fig1.savefig(buf1, format='png')
-            buf1.seek(0)
-            img1_b64 = base64.b64encode(buf1.read()).decode('ascii')
+            # Encode straight from the buffer's memory; read() would copy the PNG bytes first
+            img1_b64 = base64.b64encode(buf1.getbuffer()).decode('ascii')
             coef_html = f"""
 <html>
 <head><title>EC Coefficients - {sanitized_mac}</title></head>
@@ -254,11 +332,9 @@ def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir):
     any_plotted = False
     for statsType, name in psd_types.items():
         if statsType in decoded_data:
-            full_x, full_y = [], []
-            for subBandId, data in decoded_data[statsType].items():
-                full_x.extend(data.get('frequencies_mhz', []))
-                full_y.extend(data.get('values', []))
-            if full_x and full_y:
+            full_x = _concat_subbands(decoded_data[statsType].values(), 'frequencies_mhz')
+            full_y = _concat_subbands(decoded_data[statsType].values(), 'values')
+            if full_x.size and full_y.size:
                 ax2.plot(full_x, full_y, label=name)
                 any_plotted = True
     ax2.set_title(f'EC PSD Metrics for {mac_address}')
@@ -278,8 +354,8 @@ def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir):
         else:
             buf2 = io.BytesIO()
             fig2.savefig(buf2, format='png')
-            buf2.seek(0)
-            img2_b64 = base64.b64encode(buf2.read()).decode('ascii')
+            # Encode straight from the buffer's memory; read() would copy the PNG bytes first
+            img2_b64 = base64.b64encode(buf2.getbuffer()).decode('ascii')
             psd_html = f"""
 <html>
 <head><title>EC PSD - {sanitized_mac}</title></head>
@@ -299,34 +375,39 @@ def generate_ec_html_report_matlab(mac_address, decoded_data, output_dir):
 
     # Open generated files
     try:
-        webbrowser.open_new_tab(f"file://{os.path.abspath(coef_filename)}")
+        if open_browser:
+            _open_in_browser(coef_filename)
     except Exception:
         pass
     try:
-        webbrowser.open_new_tab(f"file://{os.path.abspath(psd_filename)}")
+        if open_browser:
+            _open_in_browser(psd_filename)
     except Exception:
         pass
 
     return coef_filename, psd_filename
 
-def generate_us_psd_report(mac_address, us_psd_data, target_psd, output_dir, eq_adjust=None, atten_adjust=None, child_mac_address=None):
+def generate_us_psd_report(mac_address, us_psd_data, target_psd, output_dir, eq_adjust=None, atten_adjust=None, child_mac_address=None, timestamp=None, open_browser=True):
     """Generates an interactive HTML plot for the US PSD, Target PSD, and Delta."""
     sanitized_mac = mac_address.replace(':', '')
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = timestamp or datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)
     fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.1, subplot_titles=("Upstream PSD vs. Target", "Delta (Measured - Target)"))
     
-    full_freq, full_psd = [], []
-    for subBandId in sorted(us_psd_data.keys()):
-        data = us_psd_data[subBandId]
-        full_freq.extend(data.get('frequencies_mhz', []))
-        full_psd.extend(data.get('values', []))
-
-    fig.add_trace(go.Scatter(x=full_freq, y=full_psd, mode='lines', name='Measured US PSD'), row=1, col=1)
-    fig.add_trace(go.Scatter(x=full_freq, y=[target_psd] * len(full_freq), mode='lines', name='Target PSD', line=dict(dash='dash', color='red')), row=1, col=1)
+    subbands = [us_psd_data[subBandId] for subBandId in sorted(us_psd_data.keys())]
+    full_freq = _concat_subbands(subbands, 'frequencies_mhz')
+    full_psd = _concat_subbands(subbands, 'values')
+
+    plot_freq, plot_psd = _downsample(full_freq, full_psd)
+    fig.add_trace(go.Scattergl(x=plot_freq, y=plot_psd, mode='lines', name='Measured US PSD'), row=1, col=1)
+    fig.add_trace(go.Scattergl(x=plot_freq, y=np.full(len(plot_freq), target_psd), mode='lines', name='Target PSD', line=dict(dash='dash', color='red')), row=1, col=1)
     
-    delta = np.array(full_psd) - target_psd
-    delta_filtered = [d if abs(d) <= 25 else None for d in delta]
-    fig.add_trace(go.Scatter(x=full_freq, y=delta_filtered, mode='lines', name='Delta', line=dict(color='green')), row=2, col=1)
+    delta = full_psd - target_psd
+    # Deltas beyond +/-25 dB are outliers; NaN leaves a gap in the line just like None. They are masked
+    # before downsampling, which would otherwise favour them as extremes: buckets holding only outliers
+    # stay gaps, while shorter outlier runs inside a bucket are bridged by the line.
+    delta_filtered = np.where(np.abs(delta) <= 25, delta, np.nan)
+    delta_freq, delta_filtered = _downsample(full_freq, delta_filtered)
+    fig.add_trace(go.Scattergl(x=delta_freq, y=delta_filtered, mode='lines', name='Delta', line=dict(color='green')), row=2, col=1)
 
     title_text = f'Upstream PSD Analysis for Parent: {mac_address}'
     if child_mac_address:
@@ -345,51 +426,43 @@ def generate_us_psd_report(mac_address, us_psd_data, target_psd, output_dir, eq_
         filename_prefix += f"_child_{sanitized_child}"
     output_filename = os.path.join(output_dir, f"{filename_prefix}_get_us_psd_report_{timestamp}.html")
     try:
-        pio.write_html(fig, output_filename)
-        #open html
-        abs_path = os.path.abspath(output_filename)
-        # print(f"{abs_path}")
-        url = f"file://{abs_path}"
-        webbrowser.open_new_tab(url)        
+        _save_html_report(fig, output_filename, open_browser)
         logging.info(f"[{mac_address}] Interactive US PSD report saved to {output_filename}")
         return output_filename
     except Exception as e:
         logging.error(f"[{mac_address}] Failed to save interactive US PSD report: {e}")
         return None
 
-def generate_wbfft_report(mac_address, final_df, power_results, output_dir):
+def generate_wbfft_report(mac_address, final_df, power_results, output_dir, timestamp=None, open_browser=True):
     """Generates an interactive HTML plot for the combined WBFFT results."""
     fig = make_subplots(rows=2, cols=1, shared_xaxes=True, vertical_spacing=0.15,
                         subplot_titles=("WBFFT Power Spectrum", "Calculated Channel Power"))
 
     # Plot 1: WBFFT Power Spectrum
+    freq_mhz = final_df['Frequency'].to_numpy() / 1e6
     for col in final_df.columns:
         if col != 'Frequency':
-            fig.add_trace(go.Scatter(x=final_df['Frequency'] / 1e6, y=final_df[col],
-                                     mode='lines', name=col), row=1, col=1)
+            plot_x, plot_y = _downsample(freq_mhz, final_df[col].to_numpy())
+            fig.add_trace(go.Scattergl(x=plot_x, y=plot_y, mode='lines', name=col), row=1, col=1)
 
     # Plot 2: Channel Power
     if power_results:
         grouped_power_data = {}
         for item in power_results:
             measurement_name = item.get('Measurement')
-            if not measurement_name:
-                continue
-            
-            if measurement_name not in grouped_power_data:
-                grouped_power_data[measurement_name] = {'x': [], 'y': []}
-            
-            power_val = item.get('Channel_Power_dBmV')
-            if power_val is not None and np.isfinite(power_val):
-                grouped_power_data[measurement_name]['x'].append(item.get('CenterFrequency_MHz'))
-                grouped_power_data[measurement_name]['y'].append(power_val)
+            if measurement_name:
+                grouped_power_data.setdefault(measurement_name, []).append(item)
         
-        for name, data in grouped_power_data.items():
-            if data['x']:
+        for name, items in grouped_power_data.items():
+            # Missing (None) or non-finite powers are masked out in one pass per measurement
+            x = np.array([item.get('CenterFrequency_MHz') for item in items], dtype=float)
+            y = np.array([item.get('Channel_Power_dBmV') for item in items], dtype=float)
+            finite = np.isfinite(y)
+            if finite.any():
                 fig.add_trace(
                     go.Scatter(
-                        x=data['x'],
-                        y=data['y'],
+                        x=x[finite],
+                        y=y[finite],
                         mode='lines+markers',
                         name=f"{name} (Channel Power)"
                     ),
@@ -406,16 +479,11 @@ def generate_wbfft_report(mac_address, final_df, power_results, output_dir):
     fig.update_xaxes(title_text="Frequency (MHz)", row=2, col=1)
 
     sanitized_mac = mac_address.replace(':', '')
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    timestamp = timestamp or datetime.now().strftime(REPORT_TIMESTAMP_FORMAT)
     output_filename = os.path.join(output_dir, f"{sanitized_mac}_get_wbfft_data_{timestamp}.html")
 
     try:
-        pio.write_html(fig, output_filename)
-        abs_path = os.path.abspath(output_filename)
-        logging.info(f"Opening interactive WBFFT report in web browser: {abs_path}")
-        # print(f"{abs_path}")
-        url = f"file://{abs_path}"
-        webbrowser.open_new_tab(url)
+        _save_html_report(fig, output_filename, open_browser)
         logging.info(f"[{mac_address}] Interactive WBFFT report saved to {output_filename}")
 
         return output_filename
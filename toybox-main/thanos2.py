@@ -19,6 +19,8 @@ import re
 import requests
 import sys
 
+from requests.adapters import HTTPAdapter
+
 from websec import WebsecTokenService
 
 THANOS_SERVICE = dict(
@@ -26,6 +28,10 @@ THANOS_SERVICE = dict(
     prod="https://api.metrics.ngan.comcast.net/api/v1",
 )
 
+# Shared session so repeated queries in one process reuse pooled TLS connections
+SESSION = requests.Session()
+SESSION.mount('https://', HTTPAdapter(pool_connections=32, pool_maxsize=32))
+
 ################
 
 def escape_percent(s):
@@ -45,18 +51,22 @@ def escape_percent(s):
         out += escaped.get(c, c)
 
     return out
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def thanos_query(metric, filters=None, prod_dev='dev', duration=None, time_range=None):
+# Seconds to wait on the Thanos API before giving up on a query
+REQUEST_TIMEOUT = 30
+
+def thanos_query(metric, filters=None, prod_dev='dev', duration=None, time_range=None,
+                 token=None, session=None, timeout=REQUEST_TIMEOUT):
     if filters is None:
         filters = []
     assert isinstance(filters, list)
 
     url_service = THANOS_SERVICE[prod_dev]
 
-    ws_label = 'thanos-' + prod_dev
-    ws = WebsecTokenService()
-    token = ws.get_token(ws_label)
+    if token is None:
+        ws_label = 'thanos-' + prod_dev
+        ws = WebsecTokenService()
+        token = ws.get_token(ws_label)
     assert token
 
     if metric in ('/labels', '/targets', '/rules'):
@@ -101,7 +111,7 @@ def thanos_query(metric, filters=None, prod_dev='dev', duration=None, time_range
         'Authorization': 'Bearer ' + token,
     }
 
-    resp = requests.get(url, headers=req_headers)
+    resp = (session or SESSION).get(url, headers=req_headers, timeout=timeout)
     logging.debug('resp.status_code=%d', resp.status_code)
     if resp.status_code != 200:
         raise Exception('status code %d' % resp.status_code)
@@ -109,6 +119,7 @@ def thanos_query(metric, filters=None, prod_dev='dev', duration=None, time_range
         return resp.json()
 
 def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
     parser = argparse.ArgumentParser()
     parser.add_argument('--debug', dest='loglevel', action='store_const',
                         const=logging.INFO, default=logging.INFO)
@@ -118,7 +118,7 @@ class WebsecTokenService:
         ctx = ssl.create_default_context()
         ctx.check_hostname = False
         ctx.verify_mode = ssl.CERT_NONE
-        conn = http.client.HTTPSConnection(url_host, context=ctx)
+        conn = http.client.HTTPSConnection(url_host, timeout=self.timeout, context=ctx)
         logging.debug('headers=%r', headers)
         logging.debug('params=%r', params)
         conn.request(method, url_path, headers=headers, body=params)
@@ -1,9 +1,14 @@
-import ast
 import logging
 import sys
 import subprocess
 import os
 import json
+import re
+import time
+import threading
+import concurrent.futures
+import functools
+import importlib.util
 from PIL import ImageGrab
 from datetime import datetime
 import os
@@ -17,6 +22,32 @@ class HardStopException(Exception):
         self.mac_address = mac_address
     # --- FIX END ---
 
+# Setting values that disable a prompt, and user answers that confirm one (compared lower-cased)
+_FALSE_STRS = frozenset({'false'})
+_YES_STRS = frozenset({'yes', 'y'})
+
+def build_prompt_flags(settings):
+    """
+    Maps every key in the 'General settings' section to whether it asks for a prompt.
+    Only boolean false or the string "false" (any case) disables a prompt.
+    """
+    # --- FIX: Handle both boolean `false` and string "false" ---
+    # This makes the check more robust against common config file variations.
+    return {key: not (value is False or (isinstance(value, str) and value.lower() in _FALSE_STRS))
+            for key, value in settings.get("General settings", {}).items()}
+
+# Last (General settings dict, flags) seen by should_proceed. Settings are loaded once and not edited
+# in place, so the dict's identity is enough to tell when the flags need rebuilding.
+_prompt_flags_cache = [(None, None)]
+
+def _get_prompt_flags(settings):
+    general_settings = settings.get("General settings")
+    cached_settings, flags = _prompt_flags_cache[0]
+    if general_settings is None or cached_settings is not general_settings:
+        flags = build_prompt_flags(settings)
+        _prompt_flags_cache[0] = (general_settings, flags)
+    return flags
+
 def should_proceed(prompt_message, settings, prompt_key):
     """
     Checks a task-specific prompt setting from settings.json.
@@ -24,11 +55,7 @@ def should_proceed(prompt_message, settings, prompt_key):
     If true or any other value (or missing), it prompts the user for confirmation.
     """
     # Default to prompting if the setting is missing for safety.
-    prompt_setting = settings.get("General settings", {}).get(prompt_key, True)
-
-    # --- FIX: Handle both boolean `false` and string "false" ---
-    # This makes the check more robust against common config file variations.
-    if prompt_setting is False or (isinstance(prompt_setting, str) and prompt_setting.lower() == 'false'):
+    if not _get_prompt_flags(settings).get(prompt_key, True):
         # If disabled, log the automatic action and proceed.
         log_msg = prompt_message.replace('PROMPT ', '').split(' (yes/no)')[0]
         logging.info(f"Auto-proceeding as per setting '{prompt_key}': {log_msg}")
@@ -36,19 +63,61 @@ def should_proceed(prompt_message, settings, prompt_key):
     else:
         # If enabled (or missing), display the prompt and wait for user input.
         user_input = input(f"{prompt_message} ")
-        return user_input.lower().strip() == 'yes'
+        return user_input.strip().lower() in _YES_STRS
+
+# Helper scripts imported in-process, keyed by absolute path; None marks a script that has to run as a subprocess
+_SCRIPT_MODULES = {}
+_SCRIPT_MODULES_LOCK = threading.Lock()
+
+def _load_script_module(script_path):
+    """Imports a helper script such as Get_IP_v2.2.py as a module once; returns None if it cannot be imported."""
+    path = os.path.abspath(script_path)
+    with _SCRIPT_MODULES_LOCK:
+        if path not in _SCRIPT_MODULES:
+            module_name = '_script_' + re.sub(r'\W', '_', os.path.splitext(os.path.basename(path))[0])
+            try:
+                spec = importlib.util.spec_from_file_location(module_name, path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+            except (Exception, SystemExit) as e:
+                # e.g. a script without a __main__ guard that exits at import time
+                logging.warning(f"Could not import {script_path} in-process ({e!r}); running it as a script instead.")
+                module = None
+            _SCRIPT_MODULES[path] = module
+        return _SCRIPT_MODULES[path]
+
+# Seconds a successful MAC -> IP lookup is reused before Get_IP is asked again
+IP_CACHE_TTL = 300
+# (mac_address, environment, ip_type, script_path) -> (monotonic timestamp, ip_address)
+_IP_CACHE = {}
+# Seconds a Get_IP subprocess may run before it is killed and the lookup reported as an error
+IP_LOOKUP_TIMEOUT = 60
 
 def get_ip_for_mac(mac_address, environment, ip_type, script_path):
-    """Calls the Get_IP_v2.2.py script for a single MAC address."""
+    """Calls the Get_IP_v2.2.py script for a single MAC address, reusing a recent answer for the same lookup."""
+    key = (mac_address, environment, ip_type, script_path)
+    hit = _IP_CACHE.get(key)
+    if hit and time.monotonic() - hit[0] < IP_CACHE_TTL:
+        logging.info(f"[{mac_address}] Found IP (cached): {hit[1]}")
+        return hit[1]
     if not os.path.exists(script_path):
         logging.error(f"[{mac_address}] Script not found at: {script_path}")
         return "Script Not Found"
     try:
-        command = [sys.executable, script_path, environment, ip_type, mac_address]
-        process = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8')
-        ip_address = process.stdout.strip()
+        module = _load_script_module(script_path)
+        if module is not None and hasattr(module, 'lookup'):
+            # In-process: no interpreter start-up or stdout round-trip per MAC. IP_LOOKUP_TIMEOUT does not apply;
+            # the websec token fetch and each Thanos query carry their own timeouts instead
+            ip_address = module.lookup(environment, ip_type, mac_address).get(mac_address) or ''
+        else:
+            command = [sys.executable, script_path, environment, ip_type, mac_address]
+            process = subprocess.run(command, capture_output=True, text=True, check=True, encoding='utf-8', timeout=IP_LOOKUP_TIMEOUT)
+            ip_address = process.stdout.strip()
         logging.info(f"[{mac_address}] Found IP: {ip_address}")
-        return ip_address if ip_address else "Not Found"
+        if not ip_address:
+            return "Not Found"
+        _IP_CACHE[key] = (time.monotonic(), ip_address)
+        return ip_address
     except subprocess.CalledProcessError as e:
         logging.error(f"[{mac_address}] Error during IP lookup. Stderr: {e.stderr.strip()}")
         return "Error"
@@ -56,24 +125,95 @@ def get_ip_for_mac(mac_address, environment, ip_type, script_path):
         logging.error(f"[{mac_address}] Unexpected error during IP lookup: {e}")
         return "Error"
 
+def get_ips_for_macs_parallel(mac_addresses, environment, ip_type, script_path, max_workers=8):
+    """Runs get_ip_for_mac for several MAC addresses concurrently; returns MAC -> IP (or its error marker)."""
+    mac_addresses = list(dict.fromkeys(mac_addresses))
+    if len(mac_addresses) <= 1:
+        return {mac: get_ip_for_mac(mac, environment, ip_type, script_path) for mac in mac_addresses}
+    # Each lookup waits on a subprocess or the network, so threads overlap them despite the GIL
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(max_workers, len(mac_addresses))) as executor:
+        results = executor.map(lambda mac: get_ip_for_mac(mac, environment, ip_type, script_path), mac_addresses)
+        return dict(zip(mac_addresses, results))
+
+def get_ips_for_macs(mac_addresses, environment, ip_type, script_path):
+    """
+    Looks up several MAC addresses with a single Get_IP_v2.2.py call.
+
+    Returns a dict of MAC -> IP address, or the same "Not Found" / "Error" / "Script Not Found"
+    markers get_ip_for_mac uses. Recently cached answers are reused; a script that cannot be
+    imported with a lookup() function is called once per MAC instead.
+    """
+    ips = {}
+    pending = []
+    now = time.monotonic()
+    for mac_address in dict.fromkeys(mac_addresses):
+        hit = _IP_CACHE.get((mac_address, environment, ip_type, script_path))
+        if hit and now - hit[0] < IP_CACHE_TTL:
+            logging.info(f"[{mac_address}] Found IP (cached): {hit[1]}")
+            ips[mac_address] = hit[1]
+        else:
+            pending.append(mac_address)
+    if not pending:
+        return ips
+    if not os.path.exists(script_path):
+        logging.error(f"Script not found at: {script_path}")
+        ips.update(dict.fromkeys(pending, "Script Not Found"))
+        return ips
+
+    module = _load_script_module(script_path)
+    if module is None or not hasattr(module, 'lookup'):
+        # Only a script that can be imported in-process is known to support batch lookups
+        ips.update(get_ips_for_macs_parallel(pending, environment, ip_type, script_path))
+        return ips
+    try:
+        found = module.lookup(environment, ip_type, pending)
+    except Exception as e:
+        logging.error(f"Unexpected error during batch IP lookup: {e}")
+        ips.update(dict.fromkeys(pending, "Error"))
+        return ips
+
+    now = time.monotonic()
+    for mac_address in pending:
+        ip_address = found.get(mac_address) or ''
+        logging.info(f"[{mac_address}] Found IP: {ip_address}")
+        if ip_address:
+            _IP_CACHE[(mac_address, environment, ip_type, script_path)] = (now, ip_address)
+            ips[mac_address] = ip_address
+        else:
+            ips[mac_address] = "Not Found"
+    return ips
+
+# Compiled once for clean_raw_output, which runs on every SSH capture
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[a-zA-Z]')
+# Control characters dropped by clean_raw_output (everything below 0x20 except \t, \n, \r, plus DEL)
+_CTRL_DROP = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f])
+
+# Devices repeat the same banners, prompts and headers, so cleaned results are memoized;
+# chunks at or above the size limit bypass the cache to keep its memory bounded.
+CLEAN_CACHE_MAX_LEN = 16384
+
 def clean_raw_output(raw_text):
     """Cleans raw SSH output for better readability by removing control characters and normalizing lines."""
-    import re
     if not isinstance(raw_text, str):
         return raw_text
+    if len(raw_text) < CLEAN_CACHE_MAX_LEN:
+        return _clean_cached(raw_text)
+    return _clean(raw_text)
+
+def _clean(raw_text):
+    # Remove ANSI escape codes first (their ESC would otherwise be dropped on its own and leave
+    # the '[..m' tail behind), then the remaining non-printable control characters in one C pass.
+    cleaned_text = _ANSI_RE.sub('', raw_text) if '\x1b' in raw_text else raw_text
+    cleaned_text = cleaned_text.translate(_CTRL_DROP)
     
-    # This regex removes most ANSI escape codes and other non-printable control characters.
-    cleaned_text = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]|\x1b\[[0-9;]*[a-zA-Z]', '', raw_text)
-    
-    # Standardize line endings to \n
-    cleaned_text = cleaned_text.replace('\r\n', '\n').replace('\r', '\n')
-    
-    # Split by lines, strip whitespace from each, and filter out any that are now empty
-    lines = [line.strip() for line in cleaned_text.split('\n')]
-    non_empty_lines = [line for line in lines if line]
+    # Treat a bare \r as a line break; the \r of a \r\n pair is removed by strip() below,
+    # and the empty line a \r\n pair would otherwise leave behind is filtered out anyway.
+    cleaned_text = cleaned_text.replace('\r', '\n')
     
-    # Join them back together
-    return '\n'.join(non_empty_lines)
+    # Strip each line, drop the empty ones and join them back together in one pass
+    return '\n'.join(filter(None, map(str.strip, cleaned_text.split('\n'))))
+
+_clean_cached = functools.lru_cache(maxsize=1024)(_clean)
 
 def save_gui_as_png(root, output_dir):
     """
@@ -96,8 +236,13 @@ def save_gui_as_png(root, output_dir):
         # Define the bounding box for the screenshot
         bbox = (x, y, x + width, y + height)
         
+        # ImageGrab copies the whole desktop before cropping to bbox, so only span all monitors
+        # when the window actually extends beyond the primary screen.
+        on_primary_screen = (x >= 0 and y >= 0 and x + width <= root.winfo_screenwidth()
+                             and y + height <= root.winfo_screenheight())
+        
         # Capture the image
-        img = ImageGrab.grab(bbox=bbox, all_screens=True)
+        img = ImageGrab.grab(bbox=bbox, all_screens=not on_primary_screen)
         
         # Create a timestamped filename
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -109,42 +254,3 @@ def save_gui_as_png(root, output_dir):
         
     except Exception as e:
         logging.error(f"Failed to save GUI screenshot: {e}")
-
-# Adding  newer function to retreive amp information
-# returns json array with MAC, IPv6, and node name regardless of which address is submitted
-def run_amp_info(image, addr):
-    cmd = [sys.executable, os.path.join(os.path.dirname(__file__), 'amp_info.py'), 'PROD', 'CPE', addr]
-    env = os.environ.copy()
-    # set_status('Running Amp Info...', ok=True)
-    # append_output(f'Running: {" ".join(cmd)}')
-    try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, env=env, timeout=60)
-        raw_out = proc.stdout.strip() if proc.stdout else ''
-        # raw_err = proc.stderr.strip() if proc.stderr else ''
-        if proc.returncode != 0:
-            # append_output(raw_err or raw_out or f'return code {proc.returncode}')
-            # set_status('Error running Amp Info', ok=False)
-            return None, raw_out
-        # try to parse output as JSON first, then as Python literal
-        parsed = None
-        if raw_out:
-            try:
-                parsed = json.loads(raw_out)
-            except Exception:
-                try:
-                    parsed = ast.literal_eval(raw_out)
-                except Exception:
-                    parsed = None
-
-        # append_output(raw_out or '(no output)')
-        # set_status('Amp Info completed', ok=True)
-        return parsed, raw_out
-
-    except subprocess.TimeoutExpired:
-        # append_output('Amp Info timed out')
-        # set_status('Timeout', ok=False)
-        return None, ''
-    except Exception as e:
-        # append_output(f'Execution error: {e}')
-        # set_status('Execution error', ok=False)
-        return None, ''
\ No newline at end of file
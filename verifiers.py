@@ -1,20 +1,57 @@
-def verify_configuration(parsed_config, settings_section):
-    """Compares parsed device config against the original settings."""
-    mismatches = []
+# Settings keys that verify_configuration does not compare against the device
+_SKIP_KEYS = frozenset(['ds_override_enabled', 'ds-start-freq-cc', 'port'])
+
+# id(settings_section) -> (settings_section, plan) for the most recently verified sections. Settings are
+# not edited in place, so a plan is built once per section object; the bound keeps old sections from piling up.
+_PLAN_CACHE = {}
+_PLAN_CACHE_SIZE = 16
+
+def _build_plan(settings_section):
+    """Precomputes (key, device_key, expected_value, expected_float or None, expected_lower) per compared setting."""
+    plan = []
     for key, expected_value in settings_section.items():
-        if expected_value == "" or key in ['ds_override_enabled', 'ds-start-freq-cc', 'port']:
+        if expected_value == "" or key in _SKIP_KEYS:
             continue
         device_key = key.replace('_', '-') if not key.startswith('subband_') else key
-        device_value = parsed_config.get(device_key)
-        if device_value is None:
-            mismatches.append({"parameter": key, "expected": expected_value, "found": "Not Found"})
-            continue
         try:
-            if float(device_value) != float(expected_value):
-                mismatches.append({"parameter": key, "expected": expected_value, "found": float(device_value)})
+            expected_float = float(expected_value)
+        except (ValueError, TypeError):
+            expected_float = None
+        plan.append((key, device_key, expected_value, expected_float, str(expected_value).lower()))
+    return plan
+
+def _get_plan(settings_section):
+    cached = _PLAN_CACHE.get(id(settings_section))
+    if cached is not None and cached[0] is settings_section:
+        return cached[1]
+    plan = _build_plan(settings_section)
+    if len(_PLAN_CACHE) >= _PLAN_CACHE_SIZE:
+        # dicts keep insertion order, so this evicts the oldest section
+        del _PLAN_CACHE[next(iter(_PLAN_CACHE))]
+    _PLAN_CACHE[id(settings_section)] = (settings_section, plan)
+    return plan
+
+_MATCH = object()
+
+def _mismatched_value(device_value, expected_float, expected_lower):
+    """Returns _MATCH, or the value to report as found: numeric when both sides are numbers, else the raw device value."""
+    if expected_float is not None:
+        try:
+            found = float(device_value)
         except (ValueError, TypeError):
-            if str(device_value).lower() != str(expected_value).lower():
-                mismatches.append({"parameter": key, "expected": expected_value, "found": device_value})
+            pass
+        else:
+            return _MATCH if found == expected_float else found
+    return _MATCH if str(device_value).lower() == expected_lower else device_value
+
+def verify_configuration(parsed_config, settings_section):
+    """Compares parsed device config against the original settings."""
+    mismatches = []
+    for key, device_key, expected_value, expected_float, expected_lower in _get_plan(settings_section):
+        device_value = parsed_config.get(device_key)
+        found = "Not Found" if device_value is None else _mismatched_value(device_value, expected_float, expected_lower)
+        if found is not _MATCH:
+            mismatches.append({"parameter": key, "expected": expected_value, "found": found})
     return (False, mismatches) if mismatches else (True, "All settings match.")
 
 def verify_ds_freq_override_config(parsed_config, settings_section):
@@ -26,36 +63,42 @@ def verify_ds_freq_override_config(parsed_config, settings_section):
     else:
         return False, [{"parameter": "status", "expected": expected_status, "found": found_status or "Not Found"}]
 
+# device_type -> atten-and-eq settings key -> device config keys it is checked against
+_RF_PLANS = {
+    device_type: {
+        'legacy-input-atten': ('legacy-us-input-atten main', 'legacy-us-input-atten aux') if device_type == 'MB' else ('legacy-us-input-atten main',),
+        'ds-output-atten': ('ds-output-attenuation-db',),
+        'ds-output-eq': ('ds-output-eq-db',),
+        'us-fdx-atten': ('us-fdx-attenuation-db',),
+        'us-fdx-eq': ('us-fdx-equalization-db',),
+    }
+    for device_type in ('MB', None)
+}
+
+def _to_float(value):
+    """Returns value as a float, or None if it is not numeric."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
 def verify_rf_components_config(parsed_config, settings_section):
     """Compares parsed rf-components config against the original settings."""
     mismatches = []
-    device_type = settings_section.get('device_type')
-    key_map = {
-        'ds-output-atten': 'ds-output-attenuation-db',
-        'ds-output-eq': 'ds-output-eq-db',
-        'us-fdx-atten': 'us-fdx-attenuation-db',
-        'us-fdx-eq': 'us-fdx-equalization-db'
-    }
+    plan = _RF_PLANS['MB' if settings_section.get('device_type') == 'MB' else None]
     for settings_key, expected_value in settings_section.items():
-        if expected_value == "" or settings_key == 'device_type':
-            continue
-        keys_to_check = []
-        if settings_key == 'legacy-input-atten':
-            keys_to_check.append('legacy-us-input-atten main')
-            if device_type == 'MB':
-                keys_to_check.append('legacy-us-input-atten aux')
-        elif settings_key in key_map:
-            keys_to_check.append(key_map[settings_key])
-        else:
+        device_keys = plan.get(settings_key)
+        if device_keys is None or expected_value == "":
             continue
-        for device_key in keys_to_check:
+        expected_float = _to_float(expected_value)
+        for device_key in device_keys:
             device_value = parsed_config.get(device_key)
             if device_value is None:
                 mismatches.append({"parameter": device_key, "expected": expected_value, "found": "Not Found"})
                 continue
-            try:
-                if float(device_value) != float(expected_value):
-                    mismatches.append({"parameter": device_key, "expected": expected_value, "found": float(device_value)})
-            except (ValueError, TypeError):
-                 mismatches.append({"parameter": device_key, "expected": expected_value, "found": device_value})
+            device_float = _to_float(device_value)
+            if device_float is None or expected_float is None:
+                mismatches.append({"parameter": device_key, "expected": expected_value, "found": device_value})
+            elif device_float != expected_float:
+                mismatches.append({"parameter": device_key, "expected": expected_value, "found": device_float})
     return (False, mismatches) if mismatches else (True, "All settings match.")
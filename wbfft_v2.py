@@ -30,7 +30,7 @@ import queue
 import tkinter as tk
 
 from ssh_manager import connect_and_run_tasks
-from utils import get_ip_for_mac, HardStopException, save_gui_as_png
+from utils import get_ips_for_macs, HardStopException, save_gui_as_png
 from commands import generate_command_sequences
 from status_monitor import StatusMonitor # Import the new monitor class
 
@@ -132,14 +132,18 @@ def run_schedule_worker(schedule_data, args, amp_image, settings, constants, com
             logging.info(f"--- Step 1: Looking up IPs for {len(mac_list)} MACs in schedule item #{i} ---")
             for mac in mac_list:
                 status_queue.put((i, mac, "Running")) # Update status to show IP lookup
-                ip = get_ip_for_mac(mac, args.env, args.type, args.script_path)
+            # One lookup call for the whole item, parent MAC included
+            lookup_macs = list(mac_list) + ([parent_mac_from_schedule] if parent_mac_from_schedule else [])
+            ips = get_ips_for_macs(lookup_macs, args.env, args.type, args.script_path)
+            for mac in mac_list:
+                ip = ips[mac]
                 mac_ip_mapping[mac] = ip
                 if ip not in ["Not Found", "Error", "Script Not Found"]:
                     update_mac_ip_mapping_file(mapping_filepath, mac, ip)
             
             if parent_mac_from_schedule:
                 logging.info(f"--- Looking up IP for parent MAC: {parent_mac_from_schedule} ---")
-                parent_ip = get_ip_for_mac(parent_mac_from_schedule, args.env, args.type, args.script_path)
+                parent_ip = ips[parent_mac_from_schedule]
                 logging.info(f"Parent IP found: {parent_ip}")
                 if parent_ip not in ["Not Found", "Error", "Script Not Found"]:
                     update_mac_ip_mapping_file(mapping_filepath, parent_mac_from_schedule, parent_ip)